@@ -1,6 +1,6 @@
 {
     'name': 'iN-Clue Journey Consolidated Approach',
-    'version': '2.1',
+    'version': '2.2',
     'category': 'Events',
     'summary': 'Complete iN-Clue Journey Management System with Product-Based Ordering',
     'description': """
@@ -55,6 +55,8 @@
         # 'views/inclue_facilitator_order_views.xml',
         'views/inclue_invoice_info_views.xml',
         'views/menu_items.xml',
+        'views/inclue_participant_import_views.xml',
+        'views/inclue_journey_views.xml',
         'views/res_users_api_restriction_views.xml',
         # 'views/inclue_event_views.xml',
         # 'views/inclue_participant_views.xml',
@@ -1,3 +1,4 @@
 from . import main
 from . import sign_up_controller_api
-from . import session_middleware
\ No newline at end of file
+from . import session_middleware
+from . import participant_api
\ No newline at end of file
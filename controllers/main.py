@@ -1,75 +1,117 @@
 from odoo import http
 from odoo.http import request
 from odoo import fields
+from odoo.tools.lru import LRU
+from markupsafe import escape
 import logging
+import re
+import threading
+import time
 
 _logger = logging.getLogger(__name__)
 
+# Token bucket per (route, client IP): bursts of RATE_LIMIT_BURST requests,
+# refilled at RATE_LIMIT_PER_SECOND. Kept in worker memory so a rejected
+# request never reaches the database.
+RATE_LIMIT_BURST = 20
+RATE_LIMIT_PER_SECOND = 0.5
+RATE_LIMIT_MAX_CLIENTS = 10000
+_rate_limit_buckets = LRU(RATE_LIMIT_MAX_CLIENTS)
+_rate_limit_lock = threading.Lock()
+
+# Survey and user_input access tokens are UUID4 strings
+SURVEY_TOKEN_RE = re.compile(r'^[A-Za-z0-9-]{20,64}$')
+EMAIL_RE = re.compile(r'^[^@\s/]{1,64}@[^@\s/]{1,189}\.[^@\s/]+$')
+
+ERROR_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"/><meta name="viewport" content="width=device-width, initial-scale=1"/>
+<title>{title}</title></head>
+<body style="font-family: sans-serif; text-align: center; padding: 4em 1em;">
+<h1>{title}</h1><p>{message}</p></body></html>"""
+_error_pages = {}
+
+
+def _consume_rate_limit(route):
+    """Take one token from the client's bucket, False when it is empty"""
+    key = (route, request.httprequest.remote_addr)
+    now = time.monotonic()
+    with _rate_limit_lock:
+        tokens, last = _rate_limit_buckets.get(key, (RATE_LIMIT_BURST, now))
+        tokens = min(RATE_LIMIT_BURST, tokens + (now - last) * RATE_LIMIT_PER_SECOND)
+        allowed = tokens >= 1
+        _rate_limit_buckets[key] = (tokens - 1 if allowed else tokens, now)
+    if not allowed:
+        _logger.warning("Rate limit exceeded on %s for %s", route, key[1])
+    return allowed
+
+
+def _error_response(title, message, status=200, headers=None):
+    """Static error page, rendered once per message instead of through QWeb"""
+    body = _error_pages.get((title, message))
+    if body is None:
+        body = _error_pages[(title, message)] = ERROR_PAGE.format(title=escape(title), message=escape(message)).encode()
+    return request.make_response(body, headers=[
+        ('Content-Type', 'text/html; charset=utf-8'),
+        ('Cache-Control', 'no-store'),
+    ] + (headers or []), status=status)
+
+
+def _too_many_requests():
+    return _error_response('Too Many Requests', 'Please wait a moment before trying again.', status=429,
+                           headers=[('Retry-After', str(int(1 / RATE_LIMIT_PER_SECOND)))])
+
 class InClueSurveyController(http.Controller):
     
     @http.route('/survey/participant/<string:email>', type='http', auth='public', website=True)
     def participant_survey_redirect(self, email, **kwargs):
         """Smart redirect for participants based on their progress"""
         
+        if not _consume_rate_limit('participant_survey_redirect'):
+            return _too_many_requests()
+        
+        if len(email) > 254 or not EMAIL_RE.match(email):
+            return _error_response('Oops', 'Invalid email address', status=404)
+        
         participant = request.env['inclue.participant'].sudo().get_participant_by_email(email)
         
         if not participant:
-            return request.render('http_routing.http_error', {
-                'status_code': 'Welcome!',
-                'status_message': 'Please contact your facilitator to begin your iN-Clue Journey with the kickoff session.'
-            })
+            return _error_response('Welcome!', 'Please contact your facilitator to begin your iN-Clue Journey with the kickoff session.')
         
-        if participant.survey_id and participant.user_input_id:
-            survey_token = participant.survey_id.access_token
-            user_input_token = participant.user_input_id.access_token
-            return request.redirect(f'/survey/inclue/{survey_token}/{user_input_token}')
+        survey_path = participant.survey_id and participant._get_survey_path()
+        if survey_path:
+            return request.redirect(survey_path)
         else:
-            return request.render('http_routing.http_error', {
-                'status_code': 'Error',
-                'status_message': 'Survey not properly configured. Please contact support.'
-            })
+            return _error_response('Error', 'Survey not properly configured. Please contact support.')
     
     @http.route('/survey/inclue/<string:survey_token>/<string:user_input_token>', 
                 type='http', auth='public', website=True)
     def survey_start(self, survey_token, user_input_token, **kwargs):
         """Start survey with tokens (no login required)"""
         
-        participant = request.env['inclue.participant'].sudo().search([
-            ('access_token', '=', user_input_token)
-        ], limit=1)
-
-        _logger.info(f"Survey Token: {survey_token}, User Input Token: {user_input_token}")
-        _logger.info(f"Participant found: {participant.name if participant else 'None'}")
+        if not _consume_rate_limit('survey_start'):
+            return _too_many_requests()
         
-        if not participant:
-            return request.render('http_routing.http_error', {
-                'status_code': 'Oops',
-                'status_message': 'Invalid survey link or token'
-            })
+        if not SURVEY_TOKEN_RE.match(survey_token) or not SURVEY_TOKEN_RE.match(user_input_token):
+            return _error_response('Oops', 'Invalid survey link or token', status=404)
         
-        if participant.survey_id.access_token != survey_token:
-            _logger.error(f"Survey token mismatch: expected {participant.survey_id.access_token}, got {survey_token}")
-            return request.render('http_routing.http_error', {
-                'status_code': 'Error',
-                'status_message': 'Invalid survey token'
-            })
+        Participant = request.env['inclue.participant'].sudo()
+        entry = Participant._get_survey_token_entry(user_input_token)
         
+        if not entry:
+            _logger.debug("No participant for user input token %s", user_input_token)
+            return _error_response('Oops', 'Invalid survey link or token', status=404)
         
-        user_input = participant.user_input_id
-        if not user_input:
-            user_input = request.env['survey.user_input'].sudo().create({
-                'survey_id': participant.survey_id.id,
-                'access_token': user_input_token,
-                'email': participant.email,
-                'nickname': participant.name,
-                'state': 'new',
-            })
-            participant.sudo().write({'user_input_id': user_input.id})
+        participant_id, expected_survey_token, user_input_access_token = entry
+        if expected_survey_token != survey_token:
+            _logger.error(f"Survey token mismatch: expected {expected_survey_token}, got {survey_token}")
+            return _error_response('Error', 'Invalid survey token', status=404)
         
-
+        if not user_input_access_token:
+            # First click on a lazy link
+            user_input_access_token = Participant.browse(participant_id)._get_or_create_user_input_token()
         
-        _logger.info(f"Redirecting to survey URL: /survey/{survey_token}/{user_input_token}")
-        return request.redirect(f'/survey/{survey_token}/{user_input_token}')
+        _logger.debug("Redirecting participant %s to /survey/%s/%s", participant_id, survey_token, user_input_access_token)
+        return request.redirect(f'/survey/{survey_token}/{user_input_access_token}')
     
     @http.route('/survey/submit/<int:survey_id>/<string:token>', type='http', auth='public', methods=['POST'], website=True)
     def survey_submit(self, survey_id, token, **post):
@@ -0,0 +1,179 @@
+import base64
+import binascii
+import csv
+import io
+import json
+import odoo
+from odoo import http
+from odoo.exceptions import AccessError, UserError
+from odoo.http import request
+import logging
+
+from ..models.inclue_participant import COHORT_PROGRESS_TTL, EXPORT_COLUMNS, fetch_journey_timeline
+from ..models.inclue_participant_import import iter_import_rows
+
+_logger = logging.getLogger(__name__)
+
+EXPORT_FETCH_SIZE = 1000
+
+
+def _stream_export(dbname, query, params, export_format, with_timeline=False):
+    """Yield the export chunk by chunk from a server-side cursor
+
+    Runs after the request cursor is closed, so it reads through its own
+    cursor and only ever holds ``EXPORT_FETCH_SIZE`` rows. With
+    ``with_timeline`` the journey of each chunk is read with one query.
+    """
+    columns = [column for column, _expression in EXPORT_COLUMNS]
+    if with_timeline:
+        columns.append('timeline')
+    with odoo.registry(dbname).cursor() as cr:
+        cr.execute(f"DECLARE inclue_participant_export NO SCROLL CURSOR FOR {query}", params)
+        if export_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            yield buffer.getvalue()
+        while True:
+            cr.execute("FETCH FORWARD %s FROM inclue_participant_export", (EXPORT_FETCH_SIZE,))
+            rows = cr.fetchall()
+            if not rows:
+                break
+            if with_timeline:
+                timelines = fetch_journey_timeline(cr, [row[0] for row in rows])
+                if export_format == 'csv':
+                    rows = [row + (' > '.join(f"{step['session_type']}:{step['survey_state']}"
+                                              for step in timelines[row[0]]),) for row in rows]
+                else:
+                    rows = [row + (timelines[row[0]],) for row in rows]
+            if export_format == 'csv':
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(rows)
+                yield buffer.getvalue()
+            else:
+                yield ''.join(json.dumps(dict(zip(columns, row)), default=str) + '\n' for row in rows)
+        cr.execute("CLOSE inclue_participant_export")
+
+
+class InclueParticipantAPI(http.Controller):
+
+    @http.route('/api/v1/inclue/cohorts/progress', type='http', auth='user', methods=['GET'], csrf=False)
+    def cohort_progress(self, cohorts=None, **kwargs):
+        """
+        Participant counts per session type and survey state for one or
+        more comma-separated cohorts. Supports If-None-Match so pollers get
+        a 304 while nothing changed.
+        """
+        cohort_list = [cohort.strip() for cohort in (cohorts or '').split(',') if cohort.strip()]
+        if not cohort_list:
+            return request.make_json_response({'error': 'At least one cohort is required'}, status=400)
+
+        try:
+            counts, etag = request.env['inclue.participant']._get_cohort_progress(cohort_list)
+        except Exception as e:
+            _logger.error("Error computing cohort progress for %s: %s", cohort_list, str(e))
+            return request.make_json_response({'error': 'Server error while computing cohort progress'}, status=500)
+
+        headers = [
+            ('ETag', f'"{etag}"'),
+            ('Cache-Control', f'private, max-age={COHORT_PROGRESS_TTL}'),
+        ]
+        if request.httprequest.if_none_match.contains(etag):
+            return request.make_response('', headers=headers, status=304)
+
+        return request.make_json_response({'success': True, 'cohorts': counts}, headers=headers)
+
+    @http.route('/api/v1/inclue/participants/export', type='http', auth='user', methods=['GET'], csrf=False)
+    def export_participants(self, format='csv', company=None, cohort=None, facilitator_id=None,
+                            date_from=None, date_to=None, timeline=None, **kwargs):
+        """
+        Stream participants and their journey position as CSV or NDJSON
+        (``format=ndjson``), filtered by company name, cohort, facilitator
+        and session date range. ``timeline=1`` adds each participant's
+        session history.
+        """
+        if format not in ('csv', 'ndjson'):
+            return request.make_json_response({'error': 'format must be csv or ndjson'}, status=400)
+
+        try:
+            query, params = request.env['inclue.participant']._get_export_query(
+                company=company, cohort=cohort, facilitator_id=facilitator_id,
+                date_from=date_from, date_to=date_to,
+            )
+        except AccessError as e:
+            return request.make_json_response({'error': str(e)}, status=403)
+        except (UserError, ValueError) as e:
+            return request.make_json_response({'error': str(e)}, status=400)
+
+        content_type = 'text/csv; charset=utf-8' if format == 'csv' else 'application/x-ndjson'
+        headers = [
+            ('Content-Type', content_type),
+            ('Content-Disposition', f'attachment; filename="inclue_participants.{format}"'),
+            ('Cache-Control', 'no-store'),
+        ]
+        stream = _stream_export(request.env.cr.dbname, query, params, format, with_timeline=timeline in ('1', 'true'))
+        return request.make_response(stream, headers=headers)
+
+    @http.route('/api/v1/inclue/participants/timeline', type='http', auth='user', methods=['GET'], csrf=False)
+    def participant_timeline(self, participant_ids=None, cohort=None, **kwargs):
+        """
+        Session history of participants, given as comma-separated
+        ``participant_ids`` or as every latest participant of a ``cohort``.
+        """
+        Participant = request.env['inclue.participant']
+        try:
+            if participant_ids:
+                ids = [int(pid) for pid in participant_ids.split(',') if pid.strip()]
+            elif cohort:
+                ids = Participant.search([('cohort', '=', cohort), ('is_latest', '=', True)]).ids
+            else:
+                return request.make_json_response({'error': 'participant_ids or cohort is required'}, status=400)
+            timelines = Participant.get_journey_timeline(ids)
+        except ValueError:
+            return request.make_json_response({'error': 'participant_ids must be integers'}, status=400)
+        except AccessError as e:
+            return request.make_json_response({'error': str(e)}, status=403)
+
+        return request.make_json_response({'success': True, 'timelines': timelines})
+
+    @http.route('/api/v1/inclue/participants/import', type='json', auth='user', methods=['POST'], csrf=False)
+    def import_participants(self, **kwargs):
+        """
+        Enroll a participant list into an event.
+
+        Accepts either ``file`` (base64 CSV or XLSX content) with its
+        ``filename``, or ``rows``: a list of dicts with an ``email`` key and
+        optional ``name``, ``team_lead_name`` and ``company_name``.
+        """
+        event_id = kwargs.get('event_id')
+        if not event_id:
+            return {'error': 'event_id is required'}
+
+        try:
+            if kwargs.get('file'):
+                rows = iter_import_rows(base64.b64decode(kwargs['file']), kwargs.get('filename'))
+                first_row = 2
+            elif isinstance(kwargs.get('rows'), list):
+                rows = kwargs['rows']
+                first_row = 0
+            else:
+                return {'error': 'Either file or rows is required'}
+
+            result = request.env['inclue.participant'].import_participants(
+                int(event_id), rows,
+                first_row=first_row,
+                send_invitations=kwargs.get('send_invitations', True),
+            )
+        except (UserError, binascii.Error, ValueError) as e:
+            return {'error': str(e)}
+        except Exception as e:
+            _logger.error("Error importing participants into event %s: %s", event_id, str(e))
+            return {'error': 'Server error while importing participants'}
+
+        return {
+            'success': True,
+            'created_count': len(result['created']),
+            'created': result['created'],
+            'skipped': result['skipped'],
+        }
@@ -41,13 +41,14 @@ class SignupController(http.Controller):
             })
 
             # Construct invitation URL
-            base_url = request.env['ir.config_parameter'].sudo().get_param('web.base.url')
+            base_url = request.env['ir.config_parameter'].sudo()._get_inclue_base_url()
             invite_url = f"{base_url}/invite?token={signup_token}&email={email}&db={request.env.cr.dbname}"
 
-            # Send email (optional)
+            # Queue email (optional)
             template = request.env.ref('auth_signup.set_password_email')
             if template:
-                template.sudo().send_mail(new_user.id, force_send=True, email_values={'email_to': email})
+                request.env['inclue.mail.queue'].sudo().enqueue_template(
+                    template.sudo(), new_user.id, email_values={'email_to': email})
 
             return {
                 'success': True,
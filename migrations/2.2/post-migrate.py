@@ -0,0 +1,84 @@
+# migrations/2.2/post-migrate.py
+import logging
+
+_logger = logging.getLogger(__name__)
+
+SESSION_SEQUENCE = ['kickoff', 'followup1', 'followup2', 'followup3',
+                    'followup4', 'followup5', 'followup6']
+
+
+def migrate(cr, version):
+    """
+    Backfill the journey progress pointers, the stored survey paths and
+    the event participant counters from the existing participants
+    """
+    if not version:
+        return
+
+    _logger.info("Backfilling iN-Clue journey progress pointers...")
+
+    cr.execute("""
+        INSERT INTO inclue_journey_progress
+               (email_normalized, cohort, facilitator_id, participant_id, current_event_id,
+                survey_completed, create_uid, write_uid, create_date, write_date)
+        SELECT DISTINCT ON (p.email_normalized, p.cohort, COALESCE(p.facilitator_id, 0))
+               p.email_normalized, p.cohort, p.facilitator_id, p.id, p.event_id,
+               COALESCE(p.survey_state = 'done', FALSE), 1, 1,
+               now() at time zone 'UTC', now() at time zone 'UTC'
+          FROM inclue_participant p
+         WHERE p.is_latest
+           AND p.email_normalized IS NOT NULL
+           AND p.cohort IS NOT NULL
+         ORDER BY p.email_normalized, p.cohort, COALESCE(p.facilitator_id, 0), p.id DESC
+        ON CONFLICT (email_normalized, cohort, (COALESCE(facilitator_id, 0))) DO NOTHING
+    """)
+    _logger.info("Created %s journey progress pointers", cr.rowcount)
+
+    next_sessions = list(zip(SESSION_SEQUENCE, SESSION_SEQUENCE[1:]))
+    cr.execute("""
+        UPDATE inclue_journey_progress jp
+           SET next_event_id = (
+                SELECT e.id
+                  FROM event_event e
+                 WHERE e.is_inclue_event
+                   AND e.cohort = jp.cohort
+                   AND e.session_type = seq.next_session
+                   AND e.facilitator_id IS NOT DISTINCT FROM p.facilitator_id
+                 ORDER BY e.date_begin, e.id
+                 LIMIT 1
+           )
+          FROM inclue_participant p,
+               (VALUES %s) AS seq (session, next_session)
+         WHERE jp.participant_id = p.id
+           AND p.session_type = seq.session
+    """ % ', '.join(["(%s, %s)"] * len(next_sessions)), [value for pair in next_sessions for value in pair])
+    _logger.info("Linked %s journey progress pointers to their next session", cr.rowcount)
+
+    cr.execute("""
+        UPDATE inclue_participant p
+           SET survey_path = '/survey/inclue/' || s.access_token || '/' || ui.access_token
+          FROM survey_survey s, survey_user_input ui
+         WHERE s.id = p.survey_id
+           AND ui.id = p.user_input_id
+           AND p.survey_path IS NULL
+    """)
+    _logger.info("Stored the survey path of %s participants", cr.rowcount)
+
+    cr.execute("""
+        WITH counts AS (
+            SELECT event_id,
+                   COUNT(*) AS total,
+                   COUNT(*) FILTER (WHERE survey_state IN ('in_progress', 'done')) AS started,
+                   COUNT(*) FILTER (WHERE survey_state = 'done') AS completed
+              FROM inclue_participant
+             WHERE active IS NOT FALSE
+             GROUP BY event_id
+        )
+        UPDATE event_event e
+           SET participant_count = c.total,
+               participant_started_count = c.started,
+               participant_completed_count = c.completed
+          FROM counts c
+         WHERE e.id = c.event_id
+    """)
+    _logger.info("Initialized the participant counters of %s events", cr.rowcount)
@@ -0,0 +1,57 @@
+# migrations/2.2/pre-migrate.py
+import logging
+
+from odoo.tools import split_every
+
+from odoo.addons.inclue_consolidated_approach.models.inclue_participant import normalize_email
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """
+    Backfill the normalized participant emails and fix duplicate is_latest
+    flags before the unique indexes are created
+    """
+    if not version:
+        return
+
+    _logger.info("Backfilling normalized participant emails...")
+
+    # Creating the column here stops the ORM from recomputing it row by row;
+    # the values must match normalize_email() since they are never recomputed
+    cr.execute("ALTER TABLE inclue_participant ADD COLUMN IF NOT EXISTS email_normalized VARCHAR")
+    cr.execute("""
+        SELECT id, email FROM inclue_participant
+         WHERE email IS NOT NULL
+           AND email_normalized IS NULL
+    """)
+    normalized = 0
+    for rows in split_every(1000, cr.fetchall()):
+        values = [value for participant_id, email in rows for value in (participant_id, normalize_email(email))]
+        cr.execute("""
+            UPDATE inclue_participant p
+               SET email_normalized = v.email_normalized
+              FROM (VALUES %s) AS v (id, email_normalized)
+             WHERE p.id = v.id
+        """ % ', '.join(["(%s, %s)"] * len(rows)), values)
+        normalized += cr.rowcount
+    _logger.info("Normalized %s participant emails", normalized)
+
+    # Keep only the most recent latest participant per email and journey;
+    # cohort names are numbered per facilitator
+    cr.execute("""
+        UPDATE inclue_participant p
+           SET is_latest = FALSE
+          FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                           PARTITION BY email_normalized, cohort, COALESCE(facilitator_id, 0)
+                           ORDER BY id DESC
+                       ) AS position
+                  FROM inclue_participant
+                 WHERE is_latest
+               ) ranked
+         WHERE p.id = ranked.id
+           AND ranked.position > 1
+    """)
+    _logger.info("Cleared is_latest on %s duplicate participants", cr.rowcount)
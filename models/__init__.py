@@ -1,6 +1,8 @@
 from . import inclue_survey_config
 from . import inclue_event  
 from . import inclue_participant
+from . import inclue_journey_progress
+from . import inclue_participant_import
 from . import res_partner
 from . import res_users
 from . import inclue_facilitator_order
@@ -13,4 +15,6 @@ from . import inclue_order_facilitators
 from . import inclue_order_facilitator_sales_order
 from . import res_users_api_restriction
 from . import account_move
+from . import inclue_mail_queue
+from . import ir_config_parameter
 
@@ -1,12 +1,114 @@
 from odoo import models, fields, api
 from datetime import datetime, timedelta
-from odoo.exceptions import UserError
-import random
-import string
+from functools import partial
+from markupsafe import Markup
+from odoo.exceptions import MissingError, UserError
+from odoo.tools.lru import LRU
+from .inclue_participant import SESSION_SEQUENCE
+import odoo
+import hashlib
+import hmac
+import re
+import secrets
 import logging
 
 _logger = logging.getLogger(__name__)
 
+# Fields read by find_journey_by_code; writing any of them invalidates its cache
+JOURNEY_CODE_LOOKUP_FIELDS = {'journey_code', 'session_type', 'is_inclue_event', 'active'}
+
+# (dbname, upper-cased journey code) -> kickoff id, only for codes that resolved
+KICKOFF_CODE_CACHE_SIZE = 4096
+_kickoff_code_cache = LRU(KICKOFF_CODE_CACHE_SIZE)
+
+# Journey codes are 4 letters followed by 4 digits
+JOURNEY_CODE_LETTERS = 26 ** 4
+JOURNEY_CODE_DIGITS = 10 ** 4
+JOURNEY_CODE_SPACE = JOURNEY_CODE_LETTERS * JOURNEY_CODE_DIGITS
+JOURNEY_CODE_ROUNDS = 8
+JOURNEY_CODE_RE = re.compile(r'^[A-Z]{4}[0-9]{4}$')
+JOURNEY_CODE_KEY_PARAM = 'inclue.journey_code_key'
+JOURNEY_CODE_RESERVED_PARAM = 'inclue.journey_code_reserved'
+
+# Permutation key and reserved positions per database; both are set once
+_journey_code_params = {}
+
+# Postcommit/postrollback data keys of the participant counters
+COUNTER_DELTAS_KEY = 'inclue.event_counter_deltas'
+RESERVED_SEATS_KEY = 'inclue.event_reserved_seats'
+
+
+def _journey_code_round(key, round_number, value):
+    digest = hmac.new(key, b'%d:%d' % (round_number, value), hashlib.sha256).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def encode_journey_code(key, position):
+    """Map a position in [0, JOURNEY_CODE_SPACE) to its journey code
+
+    A keyed Feistel network over the (letters, digits) halves: each round
+    adds a keyed hash of one half to the other, modulo the radix of that
+    half, and swaps them. Every round can be undone, so distinct positions
+    always give distinct codes.
+    """
+    left, right = divmod(position, JOURNEY_CODE_DIGITS)
+    radices = (JOURNEY_CODE_LETTERS, JOURNEY_CODE_DIGITS)
+    for round_number in range(JOURNEY_CODE_ROUNDS):
+        left, right = right, (left + _journey_code_round(key, round_number, right)) % radices[round_number % 2]
+
+    letters = ''
+    for _ in range(4):
+        left, index = divmod(left, 26)
+        letters = chr(ord('A') + index) + letters
+    return f"{letters}{right:04d}"
+
+
+def decode_journey_code(key, code):
+    """Inverse of encode_journey_code for an upper-cased code"""
+    left = 0
+    for letter in code[:4]:
+        left = left * 26 + ord(letter) - ord('A')
+    right = int(code[4:])
+
+    radices = (JOURNEY_CODE_LETTERS, JOURNEY_CODE_DIGITS)
+    for round_number in reversed(range(JOURNEY_CODE_ROUNDS)):
+        left, right = (right - _journey_code_round(key, round_number, left)) % radices[round_number % 2], left
+    return left * JOURNEY_CODE_DIGITS + right
+
+
+def _apply_counter_deltas(dbname, deltas):
+    """Add ``{event_id: [total, started, completed]}`` to the event counters
+
+    Runs in its own short READ COMMITTED transaction, one row at a time in
+    id order, so concurrent updates of the same event neither deadlock nor
+    fail to serialize, and no event row stays locked longer than a single
+    UPDATE.
+    """
+    deltas = {event_id: delta for event_id, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+    try:
+        with odoo.registry(dbname).cursor() as cr:
+            cr.execute("SET TRANSACTION ISOLATION LEVEL READ COMMITTED")
+            for event_id in sorted(deltas):
+                total, started, completed = deltas[event_id]
+                cr.execute("""
+                    UPDATE event_event
+                       SET participant_count = GREATEST(COALESCE(participant_count, 0) + %s, 0),
+                           participant_started_count = GREATEST(COALESCE(participant_started_count, 0) + %s, 0),
+                           participant_completed_count = GREATEST(COALESCE(participant_completed_count, 0) + %s, 0)
+                     WHERE id = %s
+                """, (total, started, completed, event_id))
+    except Exception as e:
+        # cron_reconcile_participant_counters catches up with lost deltas
+        _logger.error("Could not update participant counters of events %s: %s", sorted(deltas), str(e))
+
+
+def _release_reserved_seats(dbname, reserved):
+    """Give back the seats reserved by a transaction that rolled back"""
+    _apply_counter_deltas(dbname, {event_id: [-count, 0, 0] for event_id, count in reserved.items()})
+
+
 class InclueEvent(models.Model):
     _inherit = 'event.event'
 
@@ -135,6 +237,18 @@ class InclueEvent(models.Model):
         'event_id',
         string='Participants'
     )
+    participant_count = fields.Integer(
+        'Participants', readonly=True, default=0, copy=False,
+        help="Active participants, kept up to date with atomic increments"
+    )
+    participant_started_count = fields.Integer(
+        'Surveys Started', readonly=True, default=0, copy=False,
+        help="Participants whose survey is in progress or completed"
+    )
+    participant_completed_count = fields.Integer(
+        'Surveys Completed', readonly=True, default=0, copy=False,
+        help="Participants whose survey is completed"
+    )
     company_id = fields.Many2one(
         'res.company',
         string='Company',
@@ -163,28 +277,41 @@ class InclueEvent(models.Model):
         for event in self:
             event.resolved_team_leader_name = event.team_leader or (event.parent_kickoff_id.team_leader if event.parent_kickoff_id else False)
 
-    @api.model
-    def create(self, vals):
-        """Override create to automatically generate invoice for iN-Clue events"""
-        event = super(InclueEvent, self).create(vals)
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Override create to automatically generate invoice for iN-Clue events
 
-        if event.is_inclue_event and event.session_type == 'kickoff' and not event.cohort:
-            event.cohort = event._generate_cohort_id()
-            
-         # Generate journey code for kickoff events
-        if event.is_inclue_event and event.session_type == 'kickoff' and not event.journey_code:
-            event.journey_code = self._generate_journey_code()
-            _logger.info("Generated journey code: %s for event: %s", event.journey_code, event.name)
-        
-        # Create invoice if this is an iN-Clue event
-        if event.is_inclue_event and event.session_type == 'kickoff':
-            try:
-                event._create_event_invoice()
-                _logger.info("Invoice created automatically for iN-Clue event ID %s", event.id)
-            except Exception as e:
-                _logger.error("Failed to create invoice for event ID %s: %s", event.id, str(e))
+        Follow-up series created with the ``inclue_skip_kickoff_hooks``
+        context (see ``plan_journey``) skip the per-record cohort, journey
+        code and invoice hooks, which only apply to kickoffs.
+        """
+        events = super(InclueEvent, self).create(vals_list)
+
+        followups = events.filtered(lambda e: e.is_inclue_event and e.session_type != 'kickoff' and e.cohort)
+        if followups:
+            self.env['inclue.journey.progress'].sudo()._link_new_sessions(followups)
+
+        if self.env.context.get('inclue_skip_kickoff_hooks'):
+            return events
+
+        for event in events:
+            if event.is_inclue_event and event.session_type == 'kickoff' and not event.cohort:
+                event.cohort = event._generate_cohort_id()
+
+            # Generate journey code for kickoff events
+            if event.is_inclue_event and event.session_type == 'kickoff' and not event.journey_code:
+                event.journey_code = self._generate_journey_code()
+                _logger.info("Generated journey code: %s for event: %s", event.journey_code, event.name)
+
+            # Create invoice if this is an iN-Clue event
+            if event.is_inclue_event and event.session_type == 'kickoff':
+                try:
+                    event._create_event_invoice()
+                    _logger.info("Invoice created automatically for iN-Clue event ID %s", event.id)
+                except Exception as e:
+                    _logger.error("Failed to create invoice for event ID %s: %s", event.id, str(e))
         
-        return event
+        return events
     
     def _create_event_invoice(self):
         """Create an invoice for the iN-Clue event - IMPROVED VERSION WITH TOKEN"""
@@ -322,9 +449,9 @@ class InclueEvent(models.Model):
             template = self.env.ref('account.email_template_edi_invoice', False)
             if template:
                 # Override email recipient
-                template.send_mail(
-                    invoice.id, 
-                    force_send=True,
+                self.env['inclue.mail.queue'].enqueue_template(
+                    template,
+                    invoice.id,
                     email_values={'email_to': self.invoice_info_id.email}
                 )
             else:
@@ -354,89 +481,157 @@ class InclueEvent(models.Model):
         
         return income_account
     def _generate_journey_code(self):
-        """Generate unique 8-character journey code: 4 letters + 4 numbers"""
-        max_attempts = 100
-        
-        for _ in range(max_attempts):
-            # Generate 4 random letters + 4 random numbers
-            letters = ''.join(random.choices(string.ascii_uppercase, k=4))
-            numbers = ''.join(random.choices(string.digits, k=4))
-            code = letters + numbers
-            
-            # Check if code already exists
-            existing = self.env['event.event'].search([
-                ('journey_code', '=', code),
-                ('is_inclue_event', '=', True)
-            ], limit=1)
-            
-            if not existing:
-                return code
+        """Generate unique 8-character journey code: 4 letters + 4 numbers
+
+        The code is the keyed permutation of the next value of a database
+        sequence, so it is unique by construction and needs no lookup.
+        Positions taken by codes that existed before the sequence are
+        skipped.
+        """
+        key, reserved = self._get_journey_code_params()
+        while True:
+            self.env.cr.execute("SELECT nextval('inclue_journey_code_seq')")
+            position = self.env.cr.fetchone()[0] - 1
+            if position >= JOURNEY_CODE_SPACE:
+                raise UserError("All journey codes have been issued")
+            if position not in reserved:
+                return encode_journey_code(key, position)
+
+    @api.model
+    def _get_journey_code_params(self):
+        """Permutation key and reserved positions of the journey codes, cached per worker"""
+        dbname = self.env.cr.dbname
+        if dbname not in _journey_code_params:
+            ICP = self.env['ir.config_parameter'].sudo()
+            if not ICP.get_param(JOURNEY_CODE_KEY_PARAM):
+                self._init_journey_codes()
+            reserved = ICP.get_param(JOURNEY_CODE_RESERVED_PARAM) or ''
+            _journey_code_params[dbname] = (
+                bytes.fromhex(ICP.get_param(JOURNEY_CODE_KEY_PARAM)),
+                frozenset(int(position) for position in reserved.split(',') if position),
+            )
+        return _journey_code_params[dbname]
+
+    @api.model
+    def _init_journey_codes(self):
+        """Create the journey code sequence and, once, the permutation key
+
+        When the key is created, the positions the permutation maps to the
+        codes already in use are stored as reserved so the sequence never
+        hands them out. The key must not change afterwards.
+        """
+        self.env.cr.execute("CREATE SEQUENCE IF NOT EXISTS inclue_journey_code_seq")
+        ICP = self.env['ir.config_parameter'].sudo()
+        if ICP.get_param(JOURNEY_CODE_KEY_PARAM):
+            return
         
-        # Fallback if we can't generate unique code
-        raise ValueError("Unable to generate unique journey code after 100 attempts")
+        key = secrets.token_bytes(32)
+        self.env.cr.execute("SELECT DISTINCT UPPER(journey_code) FROM event_event WHERE journey_code IS NOT NULL")
+        reserved = sorted(
+            decode_journey_code(key, code) for code, in self.env.cr.fetchall() if JOURNEY_CODE_RE.match(code)
+        )
+        ICP.set_param(JOURNEY_CODE_KEY_PARAM, key.hex())
+        ICP.set_param(JOURNEY_CODE_RESERVED_PARAM, ','.join(map(str, reserved)))
+        _logger.info("Initialized journey code generation, %d existing codes reserved", len(reserved))
     
-    # Add this debug version to your event model to troubleshoot
-
     @api.model
     def find_journey_by_code(self, journey_code):
-        """Find kickoff event by journey code - DEBUG VERSION"""
-        _logger.info("=== DEBUGGING JOURNEY CODE SEARCH ===")
-        _logger.info("Searching for journey code: '%s'", journey_code)
-        _logger.info("Journey code type: %s", type(journey_code))
-        _logger.info("Journey code length: %d", len(journey_code))
-        
-        # First, let's see ALL events with journey codes
-        all_events_with_codes = self.search([
-            ('journey_code', '!=', False),
-            ('is_inclue_event', '=', True)
-        ])
-        _logger.info("All events with journey codes:")
-        for event in all_events_with_codes:
-            _logger.info("  Event ID %s: journey_code='%s', session_type='%s', active=%s", 
-                        event.id, event.journey_code, event.session_type, event.active)
-        
-        # Now search with exact criteria
-        search_domain = [
-            ('journey_code', '=', journey_code.upper()),
-            ('session_type', '=', 'kickoff'),
-            ('is_inclue_event', '=', True),
-            ('active', '=', True)
-        ]
-        _logger.info("Search domain: %s", search_domain)
-        
-        result = self.search(search_domain, limit=1)
-        _logger.info("Search result: %s", result)
-        
-        if result:
-            _logger.info("Found event: ID %s, Name: %s", result.id, result.name)
-        else:
-            _logger.warning("No event found with journey code: %s", journey_code)
-            
-            # Let's check each criteria individually
-            _logger.info("=== INDIVIDUAL CRITERIA CHECK ===")
-            
-            # Check journey_code match
-            code_matches = self.search([('journey_code', '=', journey_code.upper())])
-            _logger.info("Events matching journey_code '%s': %s", journey_code.upper(), code_matches.ids)
-            
-            # Check kickoff events
-            kickoff_events = self.search([('session_type', '=', 'kickoff'), ('is_inclue_event', '=', True)])
-            _logger.info("Kickoff events: %s", kickoff_events.ids)
-            
-            # Check active events
-            active_events = self.search([('active', '=', True), ('is_inclue_event', '=', True)])
-            _logger.info("Active events: %s", active_events.ids)
-            
-            # Check if the specific event exists but doesn't match all criteria
-            specific_event = self.search([('journey_code', '=', journey_code.upper())], limit=1)
-            if specific_event:
-                _logger.info("Found event with code but wrong criteria:")
-                _logger.info("  ID: %s, session_type: %s, is_inclue_event: %s, active: %s", 
-                            specific_event.id, specific_event.session_type, 
-                            specific_event.is_inclue_event, specific_event.active)
-        
-        _logger.info("=== END DEBUGGING ===")
+        """Find the active kickoff event for a journey code (case-insensitive)"""
+        code = (journey_code or '').strip().upper()
+        if not code:
+            return self.browse()
+
+        event_id = self._get_kickoff_id_by_code(code)
+        result = self.browse(event_id) if event_id else self.browse()
+
+        if not result and _logger.isEnabledFor(logging.DEBUG):
+            self._log_journey_code_miss(code)
         return result
+
+    @api.model
+    def _get_kickoff_id_by_code(self, code):
+        """Resolve an upper-cased journey code to a kickoff id
+
+        Resolved codes are cached in a bounded per-worker LRU, unknown codes
+        are not. ``write``/``unlink`` drop the entries of this worker; a hit
+        is only trusted once the kickoff still matches, which reads the row
+        the caller needs next anyway and catches changes made by the other
+        workers. The query matches the partial index created in ``init`` so
+        a miss is a single index probe.
+        """
+        key = (self.env.cr.dbname, code)
+        event_id = _kickoff_code_cache.get(key)
+        if event_id:
+            event = self.sudo().browse(event_id)
+            try:
+                if (event.journey_code or '').upper() == code and event.session_type == 'kickoff' \
+                        and event.is_inclue_event and event.active:
+                    return event_id
+            except MissingError:
+                pass
+            try:
+                _kickoff_code_cache.pop(key)
+            except KeyError:
+                pass
+
+        self.flush_model(['journey_code', 'session_type', 'is_inclue_event', 'active'])
+        self.env.cr.execute("""
+            SELECT id FROM event_event
+             WHERE UPPER(journey_code) = %s
+               AND session_type = 'kickoff'
+               AND is_inclue_event
+               AND active
+             LIMIT 1
+        """, (code,))
+        row = self.env.cr.fetchone()
+        if not row:
+            return None
+        _kickoff_code_cache[key] = row[0]
+        return row[0]
+
+    def _invalidate_kickoff_codes(self):
+        """Drop the cached lookups of these events' journey codes in this worker"""
+        dbname = self.env.cr.dbname
+        for code in set(self.filtered('journey_code').mapped('journey_code')):
+            try:
+                _kickoff_code_cache.pop((dbname, code.upper()))
+            except KeyError:
+                pass
+
+    @api.model
+    def _log_journey_code_miss(self, code):
+        """Debug diagnostics for a journey code that did not resolve"""
+        _logger.debug("No active kickoff event found with journey code: %s", code)
+        specific_event = self.with_context(active_test=False).search([('journey_code', '=ilike', code)], limit=1)
+        if specific_event:
+            _logger.debug("Found event with code but wrong criteria: ID: %s, session_type: %s, is_inclue_event: %s, active: %s",
+                          specific_event.id, specific_event.session_type,
+                          specific_event.is_inclue_event, specific_event.active)
+
+    def init(self):
+        self._init_journey_codes()
+        # Serves the next-session lookups of participants (cohort + session type + facilitator)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS event_event_cohort_session_facilitator_idx
+                ON event_event (cohort, session_type, facilitator_id)
+        """)
+        # One active kickoff per journey code; also serves find_journey_by_code
+        try:
+            with self.env.cr.savepoint():
+                self.env.cr.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS event_event_journey_code_kickoff_uniq
+                        ON event_event (UPPER(journey_code))
+                     WHERE journey_code IS NOT NULL
+                       AND session_type = 'kickoff'
+                       AND is_inclue_event
+                       AND active
+                """)
+        except Exception as e:
+            _logger.error("Could not create unique journey code index, duplicate codes must be fixed first: %s", str(e))
+
+    def unlink(self):
+        self._invalidate_kickoff_codes()
+        return super().unlink()
     
     def _generate_cohort_id(self):
         """Generate unique cohort ID like 'Journey1', 'Journey2', etc."""
@@ -473,10 +668,8 @@ class InclueEvent(models.Model):
         if self.session_type != 'kickoff':
             raise ValueError("Can only create follow-ups from kickoff sessions")
         
-        session_types = ['followup1', 'followup2', 'followup3', 'followup4', 'followup5', 'followup6']
-        created_sessions = []
-        
-        for session_type in session_types:
+        vals_list = []
+        for session_type in SESSION_SEQUENCE[1:]:
             if session_type not in followup_dates:
                 continue
                 
@@ -487,35 +680,97 @@ class InclueEvent(models.Model):
                 except ValueError:
                     date_begin = fields.Datetime.from_string(date_begin)
             
-            # Copy all relevant fields from kickoff
-            followup_vals = {
-                'name': f"{self.name} - {session_type.title()}",
-                'session_type': session_type,
-                'is_inclue_event': True,
-                'facilitator_id': self.facilitator_id.id,
-                'company_id': self.company_id.id,
-                'date_begin': date_begin,
-                'date_end': date_begin,
-                'cohort': self.cohort,  # SAME COHORT!
-                'parent_kickoff_id': self.id,  # Link to parent
-                'contact_person': self.contact_person,
-                'division_id': self.division_id.id if self.division_id else False,
-                'country_id': self.country_id.id if self.country_id else False,
-                'language_id': self.language_id.id if self.language_id else False,
-                'invoice_info_id': self.invoice_info_id.id if self.invoice_info_id else False,
-                'team_commitment': self.team_commitment,
-                'desired_differences': self.desired_differences,
-                'company_support': self.company_support,
-            }
-            
-            followup_session = self.env['event.event'].create(followup_vals)
-            created_sessions.append(followup_session)
-            _logger.info("Created follow-up session %s for cohort %s", session_type, self.cohort)
+            vals_list.append(self._prepare_followup_vals(session_type, date_begin, date_begin))
+        
+        created_sessions = self.env['event.event'].with_context(inclue_skip_kickoff_hooks=True).create(vals_list)
+        _logger.info("Created %d follow-up sessions for cohort %s", len(created_sessions), self.cohort)
+        return list(created_sessions)
+
+    def plan_journey(self):
+        """Schedule the follow-up sessions of these kickoffs from the survey configuration
+
+        Each follow-up starts ``days_until_next`` days (of the configuration
+        of the previous session) after the previous session and lasts as
+        long as the kickoff. Follow-ups that already exist are kept and the
+        series continues from their date. The missing sessions of all
+        kickoffs are created with one multi-create.
+
+        :return: the created follow-up events
+        """
+        if any(not event.is_inclue_event or event.session_type != 'kickoff' for event in self):
+            raise UserError("Journeys can only be planned from iN-Clue kickoff sessions")
+        unplanned = self.filtered(lambda e: not e.date_begin or not e.cohort)
+        if unplanned:
+            raise UserError(f"Kickoffs need a start date and a cohort to be planned: {', '.join(unplanned.mapped('name'))}")
+        
+        SurveyConfig = self.env['inclue.survey.config'].sudo()
+        default_days = SurveyConfig.default_get(['days_until_next']).get('days_until_next', 0)
+        days_until_next = {config.session_type: config.days_until_next for config in SurveyConfig.search([])}
+        
+        existing_dates = {
+            (session.parent_kickoff_id.id, session.session_type): session.date_begin
+            for session in self.search([
+                ('parent_kickoff_id', 'in', self.ids),
+                ('session_type', 'in', SESSION_SEQUENCE[1:]),
+            ])
+        }
+        
+        vals_list = []
+        for kickoff in self:
+            duration = kickoff.date_end - kickoff.date_begin if kickoff.date_end else timedelta()
+            date_begin = kickoff.date_begin
+            for previous_session, session_type in zip(SESSION_SEQUENCE, SESSION_SEQUENCE[1:]):
+                existing_date = existing_dates.get((kickoff.id, session_type))
+                if existing_date:
+                    date_begin = existing_date
+                    continue
+                date_begin += timedelta(days=days_until_next.get(previous_session, default_days))
+                vals_list.append(kickoff._prepare_followup_vals(session_type, date_begin, date_begin + duration))
         
-        return created_sessions
+        followups = self.with_context(inclue_skip_kickoff_hooks=True).create(vals_list)
+        _logger.info("Planned %d follow-up sessions for %d journeys", len(followups), len(self))
+        return followups
+
+    def _prepare_followup_vals(self, session_type, date_begin, date_end):
+        """Values of a follow-up session, copied from this kickoff"""
+        self.ensure_one()
+        return {
+            'name': f"{self.name} - {session_type.title()}",
+            'session_type': session_type,
+            'is_inclue_event': True,
+            'facilitator_id': self.facilitator_id.id,
+            'company_id': self.company_id.id,
+            'date_begin': date_begin,
+            'date_end': date_end,
+            'cohort': self.cohort,  # SAME COHORT!
+            'parent_kickoff_id': self.id,  # Link to parent
+            'contact_person': self.contact_person,
+            'division_id': self.division_id.id if self.division_id else False,
+            'country_id': self.country_id.id if self.country_id else False,
+            'language_id': self.language_id.id if self.language_id else False,
+            'invoice_info_id': self.invoice_info_id.id if self.invoice_info_id else False,
+            'team_commitment': self.team_commitment,
+            'desired_differences': self.desired_differences,
+            'company_support': self.company_support,
+        }
+
+    def action_plan_journey(self):
+        """Schedule the follow-up sessions of the selected kickoffs"""
+        followups = self.plan_journey()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Journey Planned',
+                'message': f"{len(followups)} follow-up sessions scheduled",
+                'type': 'success' if followups else 'warning',
+            }
+        }
 
     def write(self, vals):
         """Override write to create invoice if is_inclue_event is set to True"""
+        if JOURNEY_CODE_LOOKUP_FIELDS.intersection(vals):
+            self._invalidate_kickoff_codes()
         result = super(InclueEvent, self).write(vals)
         
         # If is_inclue_event was just set to True and no invoice exists yet
@@ -635,22 +890,130 @@ class InclueEvent(models.Model):
                 event.survey_id = False
                 _logger.debug("Event ID %s is not an iN-Clue event or has no session_type, survey_id set to False", event.id)
     
+    @api.model
+    def _queue_participant_counters(self, deltas):
+        """Add ``{event_id: [total, started, completed]}`` to the counters once this transaction commits"""
+        data = self.env.cr.postcommit.data
+        if COUNTER_DELTAS_KEY not in data:
+            data[COUNTER_DELTAS_KEY] = {}
+            self.env.cr.postcommit.add(partial(_apply_counter_deltas, self.env.cr.dbname, data[COUNTER_DELTAS_KEY]))
+        pending = data[COUNTER_DELTAS_KEY]
+        for event_id, delta in deltas.items():
+            current = pending.setdefault(event_id, [0, 0, 0])
+            for index, value in enumerate(delta):
+                current[index] += value
+
+    def _reserve_participant_seats(self, count=1):
+        """Take ``count`` seats of a capped event, False when it is full
+
+        The seats are counted with one conditional increment in a separate
+        transaction committed right away, so the event row is only locked
+        for that statement. They are given back if the calling transaction
+        rolls back; callers must not count the same participants again
+        (``inclue_seat_reserved`` context key).
+        """
+        self.ensure_one()
+        if not self.seats_limited:
+            return True
+        
+        with self.pool.cursor() as cr:
+            cr.execute("SET TRANSACTION ISOLATION LEVEL READ COMMITTED")
+            cr.execute("""
+                UPDATE event_event
+                   SET participant_count = COALESCE(participant_count, 0) + %s
+                 WHERE id = %s
+                   AND COALESCE(participant_count, 0) + %s <= seats_max
+             RETURNING id
+            """, (count, self.id, count))
+            reserved = bool(cr.fetchone())
+        if not reserved:
+            _logger.info("Event %s is full (%s seats)", self.id, self.seats_max)
+            return False
+        
+        data = self.env.cr.postrollback.data
+        if RESERVED_SEATS_KEY not in data:
+            data[RESERVED_SEATS_KEY] = {}
+            self.env.cr.postrollback.add(partial(_release_reserved_seats, self.env.cr.dbname, data[RESERVED_SEATS_KEY]))
+        data[RESERVED_SEATS_KEY][self.id] = data[RESERVED_SEATS_KEY].get(self.id, 0) + count
+        return True
+
+    def _unreserve_participant_seats(self, count=1):
+        """Give back seats reserved by this transaction that ended up unused"""
+        self.ensure_one()
+        reserved = self.env.cr.postrollback.data.get(RESERVED_SEATS_KEY, {})
+        count = min(count, reserved.get(self.id, 0))
+        if count:
+            reserved[self.id] -= count
+            _apply_counter_deltas(self.env.cr.dbname, {self.id: [-count, 0, 0]})
+
+    @api.model
+    def cron_reconcile_participant_counters(self):
+        """Cron job: recompute the participant counters that drifted, in one statement"""
+        self.env['inclue.participant'].flush_model(['event_id', 'survey_state', 'active'])
+        self.env.cr.execute("""
+            WITH counts AS (
+                SELECT event_id,
+                       COUNT(*) AS total,
+                       COUNT(*) FILTER (WHERE survey_state IN ('in_progress', 'done')) AS started,
+                       COUNT(*) FILTER (WHERE survey_state = 'done') AS completed
+                  FROM inclue_participant
+                 WHERE active
+                 GROUP BY event_id
+            )
+            UPDATE event_event e
+               SET participant_count = COALESCE(c.total, 0),
+                   participant_started_count = COALESCE(c.started, 0),
+                   participant_completed_count = COALESCE(c.completed, 0)
+              FROM event_event e2
+              LEFT JOIN counts c ON c.event_id = e2.id
+             WHERE e.id = e2.id
+               AND e.is_inclue_event
+               AND (e.participant_count, e.participant_started_count, e.participant_completed_count)
+                   IS DISTINCT FROM (COALESCE(c.total, 0), COALESCE(c.started, 0), COALESCE(c.completed, 0))
+         RETURNING e.id
+        """)
+        fixed = [row[0] for row in self.env.cr.fetchall()]
+        if fixed:
+            self.browse(fixed).invalidate_recordset(['participant_count', 'participant_started_count', 'participant_completed_count'])
+            _logger.warning("Reconciled participant counters of %d events: %s", len(fixed), fixed)
+        return len(fixed)
+
+    def action_advance_cohort(self):
+        """Move every participant of this session to the next session of the cohort"""
+        self.ensure_one()
+        if not self.is_inclue_event or not self.cohort or not self.session_type:
+            raise UserError("Only iN-Clue sessions with a cohort can be advanced")
+        
+        result = self.env['inclue.participant'].advance_cohort(self.cohort, self.session_type, self.facilitator_id.id)
+        message = f"{len(result['advanced'])} participants moved to the next session"
+        if result['unscheduled']:
+            message += f", {len(result['unscheduled'])} waiting because the next session is not scheduled yet"
+        
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Cohort Advanced',
+                'message': message,
+                'type': 'success' if result['advanced'] else 'warning',
+            }
+        }
+
     def action_send_surveys(self):
         """Send surveys to all participants"""
         self.ensure_one()
         sent_count = 0
         _logger.debug("Starting to send surveys for event ID %s", self.id)
 
-        for participant in self.participant_ids.filtered(lambda p: not p.survey_sent):
-            try:
-                _logger.debug("Sending survey to participant ID %s", participant.id)
-                if participant.send_survey():
-                    sent_count += 1
-                    _logger.info("Survey sent successfully to participant ID %s", participant.id)
-                else:
-                    _logger.warning("Failed to send survey to participant ID %s", participant.id)
-            except Exception as e:
-                _logger.error("Error sending survey to participant ID %s: %s", participant.id, str(e))
+        # One render per (session_type, language) for the whole event
+        participants = self.participant_ids.filtered(lambda p: not p.survey_sent)
+        try:
+            if participants.send_survey():
+                sent_count = len(participants)
+            else:
+                _logger.warning("Failed to send surveys to participants %s", participants.ids)
+        except Exception as e:
+            _logger.error("Error sending surveys for event ID %s: %s", self.id, str(e))
         
         _logger.info("Successfully sent %d surveys for event ID %s", sent_count, self.id)
         
@@ -778,7 +1141,7 @@ class InclueEvent(models.Model):
             })
 
             # Generate completion survey URL
-            base_url = self.env['ir.config_parameter'].get_param('web.base.url')
+            base_url = self.env['ir.config_parameter']._get_inclue_base_url()
             # completion_url = f"{base_url}/survey/{completion_survey.access_token}/{user_input.access_token}"
             completion_url = f"{base_url}/survey/{completion_survey.access_token}/{user_input.access_token}?access_token={user_input.access_token}"
 
@@ -846,6 +1209,7 @@ class InclueEvent(models.Model):
             
             sent_count = 0
             failed_count = 0
+            mail_values_list = []
             
             for event in events_tomorrow:
                 try:
@@ -876,9 +1240,8 @@ class InclueEvent(models.Model):
                     if not mail_values.get('email_from'):
                         mail_values['email_from'] = event.company_id.email or self.env.user.email
                     
-                    # Create and send email
-                    mail = self.env['mail.mail'].create(mail_values)
-                    mail.send()
+                    # Queue email, sent by the mail queue cron
+                    mail_values_list.append(mail_values)
                     
                     # Mark as sent
                     event.write({
@@ -895,7 +1258,9 @@ class InclueEvent(models.Model):
                     _logger.error("Failed to send pre-session reminder for event ID %s: %s", 
                                 event.id, str(e))
             
-            _logger.info("Pre-session reminder summary: %d sent, %d failed", 
+            self.env['inclue.mail.queue'].enqueue_mail(mail_values_list)
+            
+            _logger.info("Pre-session reminder summary: %d queued, %d failed", 
                         sent_count, failed_count)
             
             return {
@@ -933,6 +1298,7 @@ class InclueEvent(models.Model):
                 return
 
             sent = 0
+            mail_values_list = []
             for event in events:
                 # Resolve leader name and email (fallback to parent kickoff if not set)
                 team_leader_name = event.team_leader or event.parent_kickoff_id.team_leader
@@ -947,26 +1313,118 @@ class InclueEvent(models.Model):
                     mail_values['email_to'] = team_leader_email
                     mail_values['email_from'] = event.company_id.email or self.env.user.email
 
-                    mail = self.env['mail.mail'].create(mail_values)
-                    mail.send()
+                    mail_values_list.append(mail_values)
 
                     event.write({
                         'team_lead_email_sent': True,
                         'team_lead_email_sent_date': fields.Datetime.now()
                     })
 
-                    _logger.info("Sent team lead reminder for event ID %s to %s", event.id, team_leader_email)
+                    _logger.info("Queued team lead reminder for event ID %s to %s", event.id, team_leader_email)
                     sent += 1
 
                 except Exception as e:
                     _logger.error("Error sending team lead email for event %s: %s", event.id, str(e))
 
-            _logger.info("Team lead reminder summary: %d emails sent", sent)
+            self.env['inclue.mail.queue'].enqueue_mail(mail_values_list)
+            _logger.info("Team lead reminder summary: %d emails queued", sent)
 
         except Exception as e:
             _logger.error("Error in send_team_lead_reminders: %s", str(e))
 
 
+    @api.model
+    def send_facilitator_digests(self):
+        """
+        Cron job: send each facilitator one daily digest of their running
+        journeys instead of notices per participant.
+
+        The pending, started and completed counts and the overdue
+        participants of every facilitator come from one grouped query on
+        the current (latest) participants; one email is rendered per
+        facilitator and all digests are queued in a single batch.
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        overdue_days = int(ICP.get_param('inclue.reminder_delay_days', 3))
+        max_overdue = int(ICP.get_param('inclue.digest_max_overdue', 50))
+        overdue_cutoff = fields.Datetime.now() - timedelta(days=overdue_days)
+        
+        self.env['inclue.participant'].flush_model(['facilitator_id', 'event_id', 'survey_state', 'date_sent', 'is_latest', 'active'])
+        self.flush_model(['is_inclue_event', 'active'])
+        self.env.cr.execute("""
+            SELECT p.facilitator_id,
+                   COUNT(*) FILTER (WHERE p.survey_state = 'new') AS pending,
+                   COUNT(*) FILTER (WHERE p.survey_state = 'in_progress') AS started,
+                   COUNT(*) FILTER (WHERE p.survey_state = 'done') AS completed,
+                   COUNT(*) FILTER (WHERE p.survey_state != 'done' AND p.date_sent <= %(cutoff)s) AS overdue,
+                   (ARRAY_AGG(p.id ORDER BY p.date_sent, p.id)
+                        FILTER (WHERE p.survey_state != 'done' AND p.date_sent <= %(cutoff)s))[1:%(max_overdue)s]
+              FROM inclue_participant p
+              JOIN event_event e ON e.id = p.event_id
+             WHERE p.is_latest
+               AND p.active
+               AND p.facilitator_id IS NOT NULL
+               AND e.is_inclue_event
+               AND e.active
+             GROUP BY p.facilitator_id
+            HAVING COUNT(*) FILTER (WHERE p.survey_state != 'done') > 0
+        """, {'cutoff': overdue_cutoff, 'max_overdue': max_overdue})
+        rows = self.env.cr.fetchall()
+        
+        facilitators = self.env['res.partner'].browse([row[0] for row in rows])
+        overdue_participants = self.env['inclue.participant'].browse(
+            [participant_id for row in rows for participant_id in (row[5] or [])])
+        # Prefetch what the digests display in a few batched reads
+        overdue_participants.mapped('event_id.name')
+        session_labels = dict(self.env['inclue.participant']._fields['session_type']._description_selection(self.env))
+        
+        mail_values_list = []
+        for (facilitator_id, pending, started, completed, overdue, overdue_ids), facilitator in zip(rows, facilitators):
+            if not facilitator.email:
+                _logger.warning("Facilitator %s has no email, skipping digest", facilitator_id)
+                continue
+            overdue_rows = Markup('').join(
+                Markup('<tr><td>%s</td><td>%s</td><td>%s</td><td>%s</td></tr>') % (
+                    participant.name, participant.email, participant.event_id.name,
+                    session_labels.get(participant.session_type, participant.session_type or ''),
+                )
+                for participant in overdue_participants.browse(overdue_ids or [])
+            )
+            more = overdue - len(overdue_ids or [])
+            body = Markup("""
+                <div style="font-family: Arial, sans-serif; max-width: 600px;">
+                    <p>Dear %s,</p>
+                    <p>Here is today's summary of your running iN-Clue Journeys:</p>
+                    <ul>
+                        <li><strong>Not started:</strong> %s</li>
+                        <li><strong>In progress:</strong> %s</li>
+                        <li><strong>Completed:</strong> %s</li>
+                        <li><strong>Overdue (sent more than %s days ago):</strong> %s</li>
+                    </ul>
+                    %s
+                    <p>Best regards,<br/>The iN-Clue Team</p>
+                </div>
+            """) % (
+                facilitator.name, pending, started, completed, overdue_days, overdue,
+                Markup('<table style="border-collapse: collapse;" cellpadding="4"><tr><th>Participant</th>'
+                       '<th>Email</th><th>Event</th><th>Session</th></tr>%s</table>%s') % (
+                    overdue_rows, Markup('<p>... and %s more.</p>') % more if more > 0 else '',
+                ) if overdue_ids else '',
+            )
+            mail_values_list.append({
+                'subject': f'iN-Clue Daily Digest - {fields.Date.today().strftime("%B %d, %Y")}',
+                'body_html': body,
+                'email_to': facilitator.email,
+                'email_from': self.env.company.email or 'noreply@inclue.com',
+                'model': 'res.partner',
+                'res_id': facilitator.id,
+                'auto_delete': True,
+            })
+        
+        self.env['inclue.mail.queue'].enqueue_mail(mail_values_list)
+        _logger.info("Queued %d facilitator digests", len(mail_values_list))
+        return len(mail_values_list)
+
     @api.model
     def send_monthly_hr_reports(self):
         """Cron job: Send monthly completion reports to HR contacts"""
@@ -1061,10 +1519,9 @@ class InclueEvent(models.Model):
                     })]
                 }
                 
-                mail = self.env['mail.mail'].create(mail_values)
-                mail.send()
+                self.env['inclue.mail.queue'].enqueue_mail([mail_values])
                 
-                _logger.info("Sent monthly report to HR: %s", hr_contact.email)
+                _logger.info("Queued monthly report to HR: %s", hr_contact.email)
                 
         except Exception as e:
             _logger.error("Error sending HR monthly report: %s", str(e))
@@ -0,0 +1,153 @@
+from odoo import models, fields, api
+import logging
+
+from .inclue_participant import SESSION_SEQUENCE, normalize_email
+
+_logger = logging.getLogger(__name__)
+
+
+class InclueJourneyProgress(models.Model):
+    """
+    Pointer to where a person currently is in a journey.
+
+    One row per (normalized email, cohort, facilitator), maintained in the
+    same transaction as the participant changes, so "which session should
+    this person be sent to" is a single indexed read. Cohort names are
+    numbered per facilitator, so the facilitator is part of the key.
+    """
+    _name = 'inclue.journey.progress'
+    _description = 'iN-Clue Journey Progress'
+    _rec_name = 'email_normalized'
+    _order = 'write_date desc, id desc'
+
+    email_normalized = fields.Char('Normalized Email', required=True, index=True)
+    cohort = fields.Char('Cohort', required=True)
+    facilitator_id = fields.Many2one('res.partner', string='Facilitator')
+    participant_id = fields.Many2one('inclue.participant', string='Current Participant', ondelete='cascade')
+    current_event_id = fields.Many2one('event.event', string='Current Session', ondelete='set null')
+    next_event_id = fields.Many2one('event.event', string='Next Scheduled Session', ondelete='set null')
+    survey_completed = fields.Boolean('Current Session Completed', default=False)
+
+    def init(self):
+        # Replaced by the index below, which also covers the facilitator
+        self.env.cr.execute("""
+            ALTER TABLE inclue_journey_progress
+                DROP CONSTRAINT IF EXISTS inclue_journey_progress_email_cohort_unique
+        """)
+        # One progress pointer per person and journey, arbiter of _sync_participants
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS inclue_journey_progress_journey_uniq
+                ON inclue_journey_progress (email_normalized, cohort, (COALESCE(facilitator_id, 0)))
+        """)
+
+    @api.model
+    def _sync_participants(self, participants):
+        """Upsert the progress rows of the given participants
+
+        Only the latest participant of each journey moves the pointer.
+        """
+        participants = participants.filtered(lambda p: p.is_latest and p.cohort and p.email_normalized)
+        if not participants:
+            return
+
+        next_events = self._find_next_events(participants)
+
+        # ON CONFLICT cannot touch the same row twice in one statement
+        rows = {}
+        for participant in participants.sorted('id'):
+            key = (participant.email_normalized, participant.cohort, participant.facilitator_id.id or None)
+            rows[key] = key + (
+                participant.id,
+                participant.event_id.id,
+                next_events.get(participant.id),
+                participant.survey_state == 'done',
+                self.env.uid,
+                self.env.uid,
+            )
+
+        self.env['inclue.participant'].flush_model()
+        values_sql = ', '.join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, now() at time zone 'UTC', now() at time zone 'UTC')"] * len(rows))
+        params = [value for row in rows.values() for value in row]
+        self.env.cr.execute(f"""
+            INSERT INTO inclue_journey_progress
+                   (email_normalized, cohort, facilitator_id, participant_id, current_event_id, next_event_id,
+                    survey_completed, create_uid, write_uid, create_date, write_date)
+            VALUES {values_sql}
+            ON CONFLICT (email_normalized, cohort, (COALESCE(facilitator_id, 0))) DO UPDATE
+               SET participant_id = EXCLUDED.participant_id,
+                   current_event_id = EXCLUDED.current_event_id,
+                   next_event_id = EXCLUDED.next_event_id,
+                   survey_completed = EXCLUDED.survey_completed,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+        """, params)
+        self.invalidate_model()
+
+    @api.model
+    def _find_next_events(self, participants):
+        """Map participant ids to the next scheduled session of their cohort, in one search"""
+        Participant = self.env['inclue.participant']
+        wanted = {}
+        for participant in participants:
+            next_type = Participant._get_next_session_type(participant.session_type)
+            if next_type:
+                wanted[participant.id] = (participant.cohort, participant.facilitator_id.id, next_type)
+        if not wanted:
+            return {}
+
+        events = self.env['event.event'].search([
+            ('is_inclue_event', '=', True),
+            ('cohort', 'in', list({key[0] for key in wanted.values()})),
+            ('session_type', 'in', list({key[2] for key in wanted.values()})),
+        ], order='date_begin, id')
+        by_key = {}
+        for event in events:
+            by_key.setdefault((event.cohort, event.facilitator_id.id, event.session_type), event.id)
+
+        return {participant_id: by_key.get(key) for participant_id, key in wanted.items()}
+
+    @api.model
+    def _link_new_sessions(self, events):
+        """Point waiting journeys at newly scheduled follow-up sessions"""
+        for event in events.filtered(lambda e: e.is_inclue_event and e.cohort and e.session_type in SESSION_SEQUENCE):
+            index = SESSION_SEQUENCE.index(event.session_type)
+            if not index:
+                continue
+            self.env.cr.execute("""
+                UPDATE inclue_journey_progress jp
+                   SET next_event_id = %s,
+                       write_date = now() at time zone 'UTC'
+                  FROM inclue_participant p
+                 WHERE jp.participant_id = p.id
+                   AND jp.cohort = %s
+                   AND jp.next_event_id IS NULL
+                   AND p.session_type = %s
+                   AND p.facilitator_id IS NOT DISTINCT FROM %s
+            """, (event.id, event.cohort, SESSION_SEQUENCE[index - 1], event.facilitator_id.id or None))
+        self.invalidate_model()
+
+    @api.model
+    def _get_progress(self, email, cohort=None, facilitator_id=None):
+        """Read the progress pointer of an email, optionally within the journey of one cohort and facilitator"""
+        domain = [('email_normalized', '=', normalize_email(email))]
+        if cohort:
+            domain += [('cohort', '=', cohort), ('facilitator_id', '=', facilitator_id or False)]
+        return self.search(domain, limit=1)
+
+    @api.model
+    def _resolve_participant(self, email, cohort=None, facilitator_id=None):
+        """Return the participant record a person should be sent to
+
+        Advances the person to their next session when they completed the
+        current one and the next session is already scheduled.
+        """
+        progress = self._get_progress(email, cohort, facilitator_id)
+        if not progress:
+            return self.env['inclue.participant']
+
+        participant = progress.participant_id
+        if progress.survey_completed and progress.next_event_id:
+            next_participant = self.env['inclue.participant']._advance_to_event(participant, progress.next_event_id)
+            if next_participant:
+                return next_participant
+        return participant
@@ -0,0 +1,192 @@
+from datetime import timedelta
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+
+class InclueMailQueue(models.Model):
+    """
+    Outbound mail queue for every email sent by the iN-Clue module.
+
+    Call sites enqueue rendered mail values (or a template + record) and a
+    cron drains the queue in batches, so SMTP latency never lands on HTTP
+    workers or on the transaction that produced the email. Passing
+    ``inclue_mail_sync=True`` in the context dispatches the entries
+    immediately instead, which is what tests should use.
+    """
+    _name = 'inclue.mail.queue'
+    _description = 'iN-Clue Outbound Mail Queue'
+    _order = 'next_attempt_at, id'
+
+    name = fields.Char('Subject')
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ], string='State', default='pending', required=True, index=True)
+
+    template_id = fields.Many2one('mail.template', string='Template', ondelete='set null')
+    model = fields.Char('Related Model')
+    res_id = fields.Many2oneReference('Related Record', model_field='model')
+    mail_values = fields.Json('Mail Values')
+    attachment_ids = fields.Many2many('ir.attachment', string='Attachments')
+    mail_id = fields.Many2one('mail.mail', string='Mail', ondelete='set null', readonly=True)
+
+    attempts = fields.Integer('Attempts', default=0)
+    next_attempt_at = fields.Datetime('Next Attempt', default=fields.Datetime.now, index=True)
+    date_sent = fields.Datetime('Date Sent', index=True)
+    last_error = fields.Text('Last Error')
+
+    @api.model
+    def enqueue_mail(self, mail_values_list):
+        """Queue already rendered ``mail.mail`` values"""
+        vals_list = []
+        for values in mail_values_list:
+            values = dict(values)
+            attachment_ids = values.pop('attachment_ids', [])
+            if attachment_ids and all(isinstance(att, int) for att in attachment_ids):
+                attachment_ids = [(6, 0, attachment_ids)]
+            # generate_email() returns report attachments as (name, base64) pairs
+            attachment_ids += [(0, 0, {'name': name, 'datas': content})
+                               for name, content in values.pop('attachments', [])]
+            vals_list.append({
+                'name': values.get('subject'),
+                'model': values.get('model'),
+                'res_id': values.get('res_id') or 0,
+                'mail_values': values,
+                'attachment_ids': attachment_ids,
+            })
+        return self._enqueue(vals_list)
+
+    @api.model
+    def enqueue_template(self, template, res_id, email_values=None):
+        """Queue a ``mail.template`` to be rendered for ``res_id`` at send time"""
+        return self._enqueue([{
+            'name': template.name,
+            'template_id': template.id,
+            'model': template.model,
+            'res_id': res_id,
+            'mail_values': email_values or {},
+        }])
+
+    @api.model
+    def _enqueue(self, vals_list):
+        entries = self.sudo().create(vals_list)
+        if self.env.context.get('inclue_mail_sync'):
+            entries._dispatch()
+        elif entries:
+            cron = self.env.ref('inclue_consolidated_approach.ir_cron_process_mail_queue', raise_if_not_found=False)
+            if cron:
+                cron.sudo()._trigger()
+        return entries
+
+    def _build_mail(self):
+        """Materialize the queued entry into a ``mail.mail`` record"""
+        self.ensure_one()
+        values = dict(self.mail_values or {})
+        if self.template_id:
+            mail_id = self.template_id.send_mail(self.res_id, force_send=False, email_values=values)
+            mail = self.env['mail.mail'].sudo().browse(mail_id)
+        else:
+            mail = self.env['mail.mail'].sudo().create(values)
+        if self.attachment_ids:
+            mail.write({'attachment_ids': [(4, attachment.id) for attachment in self.attachment_ids]})
+        return mail
+
+    def _dispatch(self):
+        """Send the entries, scheduling a retry with exponential backoff on failure"""
+        ICP = self.env['ir.config_parameter'].sudo()
+        max_attempts = int(ICP.get_param('inclue.mail_queue_max_attempts', 5))
+        retry_delay = int(ICP.get_param('inclue.mail_queue_retry_delay', 60))
+
+        for entry in self.sudo():
+            now = fields.Datetime.now()
+            attempts = entry.attempts + 1
+            try:
+                with self.env.cr.savepoint():
+                    mail = entry._build_mail()
+                    mail.send(raise_exception=True)
+                    # auto_delete mails are unlinked as soon as they are sent
+                    mail = mail.exists()
+                    if mail and mail.state == 'exception':
+                        raise UserError(mail.failure_reason or 'Mail delivery failed')
+                entry.write({
+                    'state': 'sent',
+                    'attempts': attempts,
+                    'mail_id': mail.id,
+                    'date_sent': now,
+                    'last_error': False,
+                })
+            except Exception as e:
+                failed = attempts >= max_attempts
+                entry.write({
+                    'state': 'failed' if failed else 'pending',
+                    'attempts': attempts,
+                    'next_attempt_at': now + timedelta(seconds=retry_delay * 2 ** (attempts - 1)),
+                    'last_error': str(e),
+                })
+                _logger.warning("Mail queue entry %s failed (attempt %d/%d): %s",
+                                entry.id, attempts, max_attempts, str(e))
+
+    @api.model
+    def cron_process_queue(self, batch_size=None, max_batches=None):
+        """Cron job: drain the queue in batches, committing after each batch"""
+        ICP = self.env['ir.config_parameter'].sudo()
+        batch_size = batch_size or int(ICP.get_param('inclue.mail_queue_batch_size', 50))
+        max_batches = max_batches or int(ICP.get_param('inclue.mail_queue_max_batches', 20))
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+
+        processed = 0
+        for _ in range(max_batches):
+            # SKIP LOCKED lets several cron workers drain the queue side by side
+            self.env.cr.execute("""
+                SELECT id FROM inclue_mail_queue
+                 WHERE state = 'pending' AND next_attempt_at <= %s
+                 ORDER BY next_attempt_at, id
+                 LIMIT %s
+                 FOR UPDATE SKIP LOCKED
+            """, (fields.Datetime.now(), batch_size))
+            ids = [row[0] for row in self.env.cr.fetchall()]
+            if not ids:
+                break
+
+            self.browse(ids)._dispatch()
+            processed += len(ids)
+            if auto_commit:
+                self.env.cr.commit()
+
+        _logger.info("Mail queue run: %d entries processed, stats: %s", processed, self.get_queue_stats())
+        return processed
+
+    @api.model
+    def get_queue_stats(self, window_minutes=60):
+        """Return queue depth per state and the send rate over the last window"""
+        self.env.cr.execute("""
+            SELECT state, COUNT(*) FROM inclue_mail_queue
+             WHERE state IN ('pending', 'failed')
+             GROUP BY state
+        """)
+        depth = dict(self.env.cr.fetchall())
+
+        since = fields.Datetime.now() - timedelta(minutes=window_minutes)
+        self.env.cr.execute("""
+            SELECT COUNT(*) FROM inclue_mail_queue
+             WHERE state = 'sent' AND date_sent >= %s
+        """, (since,))
+        sent = self.env.cr.fetchone()[0]
+
+        return {
+            'pending': depth.get('pending', 0),
+            'failed': depth.get('failed', 0),
+            'sent_last_window': sent,
+            'send_rate_per_minute': round(sent / window_minutes, 2) if window_minutes else 0.0,
+        }
+
+    @api.autovacuum
+    def _gc_sent_entries(self):
+        """Drop sent entries older than 30 days"""
+        limit_date = fields.Datetime.now() - timedelta(days=30)
+        self.sudo().search([('state', '=', 'sent'), ('date_sent', '<', limit_date)]).unlink()
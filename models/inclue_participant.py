@@ -1,13 +1,227 @@
+import hashlib
+import json
 import secrets
 import string
+import threading
+import time
 from datetime import timedelta
-from odoo import models, fields, api
+from functools import partial
+from itertools import islice
+from markupsafe import Markup, escape
+import odoo
+from odoo import models, fields, api, tools
+from odoo.exceptions import UserError
+from odoo.tools import split_every
+from odoo.tools.lru import LRU
 import logging
+import psycopg2.errors
 import uuid
 
 
 _logger = logging.getLogger(__name__)
 
+SESSION_SEQUENCE = ['kickoff', 'followup1', 'followup2', 'followup3',
+                    'followup4', 'followup5', 'followup6']
+
+
+# Per-worker cache of get_cohort_progress, per user as the counts follow record rules:
+# {(dbname, cohort): {(uid, su): (expires_at, counts, etag)}}
+COHORT_PROGRESS_TTL = 30
+COHORT_PROGRESS_FIELDS = {'event_id', 'survey_state'}
+
+# Fields deciding which event counters a participant contributes to, see _get_counter_deltas()
+COUNTER_FIELDS = {'active', 'event_id', 'survey_state'}
+_cohort_progress_cache = {}
+
+# Context for mass operations on participants (imports, crons, migrations
+# going through the ORM): no tracking values, creation log or follower
+# subscription per record. Use _post_bulk_summary() to leave one note per
+# event instead.
+BULK_CONTEXT = {
+    'tracking_disable': True,
+    'mail_create_nolog': True,
+    'mail_create_nosubscribe': True,
+    'mail_notrack': True,
+}
+
+# (dbname, cache version, participant access token) -> (participant id, survey token, user_input token)
+SURVEY_TOKEN_CACHE_SIZE = 4096
+SURVEY_TOKEN_FIELDS = {'access_token', 'user_input_id', 'survey_id', 'event_id'}
+SURVEY_TOKEN_VERSION_SEQUENCE = 'inclue_survey_token_version_seq'
+_survey_token_cache = LRU(SURVEY_TOKEN_CACHE_SIZE)
+
+# Cache version sequences to bump once the transaction commits, see _queue_cache_version_bump()
+CACHE_VERSION_BUMPS_KEY = 'inclue.cache_version_bumps'
+
+# survey.user_input rows created by this worker and the seconds spent, used
+# to estimate what lazy creation saves, see get_user_input_savings()
+_user_input_create_stats = [0, 0.0]
+
+# Column name -> SQL expression of the participant export, see _get_export_query()
+EXPORT_COLUMNS = [
+    ('id', '"inclue_participant"."id"'),
+    ('name', '"inclue_participant"."name"'),
+    ('email', '"inclue_participant"."email"'),
+    ('company_name', '"inclue_participant"."company_name"'),
+    ('team_lead_name', '"inclue_participant"."team_lead_name"'),
+    ('journey_code', '"inclue_participant"."journey_code"'),
+    ('cohort', '"inclue_participant"."cohort"'),
+    ('session_type', '"inclue_participant"."session_type"'),
+    ('survey_state', '"inclue_participant"."survey_state"'),
+    ('is_latest', '"inclue_participant"."is_latest"'),
+    ('event_id', '"inclue_participant"."event_id"'),
+    ('event_name', '"inclue_participant__event_id"."name"->>\'en_US\''),
+    ('event_date', '"inclue_participant__event_id"."date_begin"'),
+    ('facilitator', '"inclue_participant__facilitator_id"."name"'),
+    ('date_sent', '"inclue_participant"."date_sent"'),
+    ('date_started', '"inclue_participant"."date_started"'),
+    ('date_completed', '"inclue_participant"."date_completed"'),
+]
+
+
+def _get_cache_version(cr, sequence):
+    """Current version of the per-worker caches keyed on ``sequence``"""
+    cr.execute(f"SELECT last_value FROM {sequence}")
+    return cr.fetchone()[0]
+
+
+def _bump_cache_versions(dbname, sequences):
+    """Move the given cache version sequences forward, see _queue_cache_version_bump()"""
+    try:
+        with odoo.registry(dbname).cursor() as cr:
+            for sequence in sorted(sequences):
+                cr.execute("SELECT nextval(%s)", (sequence,))
+    except Exception as e:
+        _logger.error("Could not bump cache versions %s: %s", sorted(sequences), str(e))
+
+
+def _queue_cache_version_bump(cr, sequence):
+    """Invalidate the caches keyed on ``sequence`` in every worker once ``cr`` commits
+
+    The entries of the other workers are simply missed under the new
+    version, the registry caches are left alone. Bumping after the commit
+    keeps another worker from caching the old values under the new version.
+    """
+    data = cr.postcommit.data
+    if CACHE_VERSION_BUMPS_KEY not in data:
+        data[CACHE_VERSION_BUMPS_KEY] = set()
+        cr.postcommit.add(partial(_bump_cache_versions, cr.dbname, data[CACHE_VERSION_BUMPS_KEY]))
+    data[CACHE_VERSION_BUMPS_KEY].add(sequence)
+
+
+def _record_user_input_creation(count, seconds):
+    _user_input_create_stats[0] += count
+    _user_input_create_stats[1] += seconds
+
+
+def normalize_email(email):
+    """Canonical form of an email used as lookup key"""
+    return tools.email_normalize(email) or (email or '').strip().lower()
+
+
+def fetch_journey_timeline(cr, participant_ids):
+    """Read the whole previous_participant_id chain of each participant in one query
+
+    Walks back to the kickoff and forward to the latest session from every
+    given participant. Returns ``{participant_id: [step, ...]}`` with the
+    steps ordered from the first session to the last.
+    """
+    if not participant_ids:
+        return {}
+    max_depth = len(SESSION_SEQUENCE)
+    ids = list(participant_ids)
+    cr.execute("""
+        WITH RECURSIVE backward (root_id, participant_id, previous_id, depth) AS (
+                SELECT p.id, p.id, p.previous_participant_id, 0
+                  FROM inclue_participant p
+                 WHERE p.id = ANY(%s)
+             UNION ALL
+                SELECT b.root_id, p.id, p.previous_participant_id, b.depth - 1
+                  FROM backward b
+                  JOIN inclue_participant p ON p.id = b.previous_id
+                 WHERE b.depth > -%s
+        ), forward (root_id, participant_id, depth) AS (
+                SELECT p.id, p.id, 0
+                  FROM inclue_participant p
+                 WHERE p.id = ANY(%s)
+             UNION ALL
+                SELECT f.root_id, p.id, f.depth + 1
+                  FROM forward f
+                  JOIN inclue_participant p ON p.previous_participant_id = f.participant_id
+                 WHERE f.depth < %s
+        )
+        SELECT chain.root_id, p.id, p.event_id, e.date_begin, p.session_type, p.survey_state,
+               p.date_sent, p.date_started, p.date_completed
+          FROM (SELECT root_id, participant_id, depth FROM backward
+                 UNION
+                SELECT root_id, participant_id, depth FROM forward WHERE depth > 0) chain
+          JOIN inclue_participant p ON p.id = chain.participant_id
+          LEFT JOIN event_event e ON e.id = p.event_id
+         ORDER BY chain.root_id, chain.depth, p.id
+    """, (ids, max_depth, ids, max_depth))
+
+    timelines = {participant_id: [] for participant_id in ids}
+    for root_id, participant_id, event_id, session_date, session_type, survey_state, \
+            date_sent, date_started, date_completed in cr.fetchall():
+        timelines[root_id].append({
+            'participant_id': participant_id,
+            'event_id': event_id,
+            'session_type': session_type,
+            'session_date': session_date,
+            'survey_state': survey_state,
+            'date_sent': date_sent,
+            'date_started': date_started,
+            'date_completed': date_completed,
+        })
+    return timelines
+
+SURVEY_INVITATION_BODY = '''
+    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+        <div style="background-color: #008f8c; color: white; padding: 20px; text-align: center;">
+            <h1 style="margin: 0;">iN-Clue Journey</h1>
+        </div>
+        
+        <div style="padding: 20px; background-color: #f9f9f9;">
+            <p>Dear $name,</p>
+            
+            <p>Thank you for participating in the <strong>$session_label</strong> session of the iN-Clue Journey.</p>
+            
+            <p>Please take a moment to complete your survey by clicking the button below:</p>
+            
+            <div style="text-align: center; margin: 30px 0;">
+                <a href="$survey_url" 
+                style="background-color: #008f8c; 
+                        color: white; 
+                        padding: 12px 30px; 
+                        text-decoration: none; 
+                        border-radius: 5px; 
+                        display: inline-block;
+                        font-weight: bold;">
+                    Complete Survey
+                </a>
+            </div>
+            
+            <p><strong>Session Details:</strong></p>
+            <ul style="list-style: none; padding-left: 0;">
+                <li>📅 Event: $event_name</li>
+                <li>👤 Facilitator: $facilitator_name</li>
+                <li>👥 Team Lead: $team_lead_name</li>
+                <li>🏢 Company: $company_name</li>
+            </ul>
+            
+            <p>This survey link is unique to you and requires no login.</p>
+            
+            <p>Thank you for your participation!</p>
+            
+            <p>Best regards,<br/>The iN-Clue Team</p>
+        </div>
+        
+        <div style="background-color: #333; color: white; padding: 10px; text-align: center; font-size: 12px;">
+            <p style="margin: 0;">© 2024 iN-Clue Journey. All rights reserved.</p>
+        </div>
+    </div>
+'''
+
 class InclueParticipant(models.Model):
     _name = 'inclue.participant'
     _description = 'iN-Clue Journey Participant'
@@ -15,6 +229,12 @@ class InclueParticipant(models.Model):
     
     name = fields.Char('Participant Name', required=True, tracking=True)
     email = fields.Char('Email', required=True, tracking=True)
+    email_normalized = fields.Char(
+        'Normalized Email',
+        compute='_compute_email_normalized',
+        store=True,
+        help="Lower-cased email used to match participants across sessions"
+    )
     team_lead_name = fields.Char('Team Lead Name', tracking=True)
     company_name = fields.Char('Company Name', tracking=True)
 
@@ -30,6 +250,7 @@ class InclueParticipant(models.Model):
     survey_id = fields.Many2one('survey.survey', related='event_id.survey_id', store=True)
     
     access_token = fields.Char('Access Token', readonly=True, copy=False)
+    survey_path = fields.Char('Survey Path', readonly=True, copy=False)
     survey_url = fields.Char('Survey URL', compute='_compute_survey_url')
     
     survey_sent = fields.Boolean('Survey Sent', default=True, tracking=True)
@@ -39,15 +260,24 @@ class InclueParticipant(models.Model):
         ('new', 'New'),
         ('in_progress', 'In Progress'),
         ('done', 'Completed')
-    ], string='Survey State', compute='_compute_survey_state', store=True)
+    ], string='Survey State', default='new', readonly=True,
+        help="Pushed from the linked survey.user_input on each state transition")
     
     is_latest = fields.Boolean('Is Latest', default=True, tracking=True)
+    active = fields.Boolean('Active', default=True)
+    merged_into_id = fields.Many2one('inclue.participant', string='Merged Into', readonly=True, copy=False,
+                                     help="Participant that replaced this duplicate, see cron_merge_duplicates")
 
     date_sent = fields.Datetime('Date Sent', default=fields.Datetime.now)  # Auto-set
     date_started = fields.Datetime('Date Started')
     date_completed = fields.Datetime('Date Completed')
+    last_reminder_at = fields.Datetime('Last Reminder', readonly=True, copy=False)
+    reminder_count = fields.Integer('Reminders Sent', default=0, readonly=True, copy=False)
+    reminders_exhausted = fields.Boolean('Reminders Exhausted', readonly=True, copy=False,
+                                         help="Set once the last reminder allowed was sent, see cron_send_reminders")
     
-    previous_participant_id = fields.Many2one('inclue.participant', string='Previous Participation')
+    previous_participant_id = fields.Many2one('inclue.participant', string='Previous Participation', index=True)
+    journey_timeline_html = fields.Html('Journey Timeline', compute='_compute_journey_timeline_html', sanitize=False)
     user_input_id = fields.Many2one('survey.user_input', string='Survey Response', readonly=True)
 
     cohort = fields.Char(
@@ -58,36 +288,270 @@ class InclueParticipant(models.Model):
     )
     
     def _ensure_survey_assignment(self):
-        """Ensure participant has proper survey and user_input setup"""
-        if not self.survey_id:
-            _logger.warning(f"Participant {self.id} has no survey_id - event {self.event_id.name} not configured")
-            return False
-            
-        if not self.user_input_id and self.survey_id:
-            user_input = self.env['survey.user_input'].create({
-                'survey_id': self.survey_id.id,
-                'email': self.email,
-                'nickname': self.name,
-                'state': 'new'
-            })
-            self.user_input_id = user_input.id
-            self.access_token = user_input.access_token
-            _logger.info(f"Created missing user_input {user_input.id} for participant {self.id}")
-            return True
-        
-        return True
+        """Ensure participants have proper survey and user_input setup
+
+        Works on a recordset: all missing user_inputs are created with a
+        single multi-create. With ``inclue.lazy_user_input`` set, only a
+        participant-level token is assigned and the user_input is created
+        on the first click of the link, see _get_or_create_user_input_token().
+        Returns the participants that are ready to receive their survey.
+        """
+        unconfigured = self.filtered(lambda p: not p.survey_id)
+        for participant in unconfigured:
+            _logger.warning(f"Participant {participant.id} has no survey_id - event {participant.event_id.name} not configured")
+
+        assigned = self - unconfigured
+        lazy = bool(self.env['ir.config_parameter'].sudo().get_param('inclue.lazy_user_input'))
+        if lazy:
+            missing = assigned.filtered(lambda p: not p.user_input_id and not p.access_token)
+        else:
+            missing = assigned.filtered(lambda p: not p.user_input_id)
+        if missing:
+            if lazy:
+                user_input_ids = [None] * len(missing)
+                tokens = [str(uuid.uuid4()) for _participant in missing]
+            else:
+                start = time.monotonic()
+                user_inputs = self.env['survey.user_input'].create([{
+                    'survey_id': participant.survey_id.id,
+                    'email': participant.email,
+                    'nickname': participant.name,
+                    'state': 'new'
+                } for participant in missing])
+                _record_user_input_creation(len(user_inputs), time.monotonic() - start)
+                user_input_ids = user_inputs.ids
+                tokens = user_inputs.mapped('access_token')
+            params = []
+            cache_key = (self.env.cr.dbname, _get_cache_version(self.env.cr, SURVEY_TOKEN_VERSION_SEQUENCE))
+            for participant, user_input_id, token in zip(missing, user_input_ids, tokens):
+                survey_token = participant.survey_id.access_token
+                params += [participant.id, user_input_id, token, f"/survey/inclue/{survey_token}/{token}"]
+                if user_input_id:
+                    # Invitations go out right away, warm the cache for the first clicks
+                    _survey_token_cache[cache_key + (token,)] = (participant.id, survey_token, token)
+            # One UPDATE for the whole batch instead of one per participant
+            missing.flush_recordset(['user_input_id', 'access_token', 'survey_path'])
+            values_sql = ', '.join(["(%s, %s::int, %s, %s)"] * len(missing))
+            self.env.cr.execute(f"""
+                UPDATE inclue_participant p
+                   SET user_input_id = v.user_input_id,
+                       access_token = v.access_token,
+                       survey_path = v.survey_path,
+                       write_uid = %s,
+                       write_date = now() at time zone 'UTC'
+                  FROM (VALUES {values_sql}) AS v (id, user_input_id, access_token, survey_path)
+                 WHERE p.id = v.id
+            """, [self.env.uid] + params)
+            missing.invalidate_recordset()
+            if lazy:
+                _logger.info(f"Assigned lazy survey links to participants {missing.ids}")
+            else:
+                _logger.info(f"Created {len(missing)} missing user_input(s) for participants {missing.ids}")
+
+        return assigned
     
-    @api.model
-    def create(self, vals):
-        vals['survey_sent'] = True
-        vals['date_sent'] = fields.Datetime.now()
-        
-        participant = super().create(vals)
+    @api.model_create_multi
+    def create(self, vals_list):
+        # Deferred invitations are stamped by send_survey() once actually queued,
+        # until then the participants are not due for reminders
+        deferred = self.env.context.get('inclue_defer_invitations')
+        now = fields.Datetime.now()
+        for vals in vals_list:
+            vals['survey_sent'] = not deferred
+            vals['date_sent'] = not deferred and now
         
-        if participant._ensure_survey_assignment():
-            participant.send_survey()
-        
-        return participant
+        participants = super().create(vals_list)
+        participants._finalize_enrollment()
+        return participants
+
+    def _finalize_enrollment(self):
+        """Assign surveys, queue invitations and move the journey pointers of new participants"""
+        assigned = self._ensure_survey_assignment()
+        if assigned and not self.env.context.get('inclue_defer_invitations'):
+            assigned.send_survey()
+
+        self.env['inclue.journey.progress']._sync_participants(self)
+        self._invalidate_cohort_progress()
+        # Seats taken through _reserve_participant_seats are already counted
+        self.env['event.event']._queue_participant_counters(
+            self._get_counter_deltas(count_total=not self.env.context.get('inclue_seat_reserved')))
+
+    def _get_counter_deltas(self, sign=1, count_total=True):
+        """Contribution of these participants to the event counters, see event.event._queue_participant_counters"""
+        deltas = {}
+        for participant in self.filtered('active'):
+            delta = deltas.setdefault(participant.event_id.id, [0, 0, 0])
+            delta[0] += sign if count_total else 0
+            delta[1] += sign if participant.survey_state in ('in_progress', 'done') else 0
+            delta[2] += sign if participant.survey_state == 'done' else 0
+        return deltas
+
+    def write(self, vals):
+        if SURVEY_TOKEN_FIELDS.intersection(vals):
+            self._invalidate_survey_tokens()
+        counted = COUNTER_FIELDS.intersection(vals)
+        if counted:
+            # Archiving or moving participants takes them out of their current
+            # counters, they are added back where they stand once written
+            self.env['event.event']._queue_participant_counters(self._get_counter_deltas(sign=-1))
+        if not COHORT_PROGRESS_FIELDS.intersection(vals):
+            result = super().write(vals)
+        else:
+            self._invalidate_cohort_progress()
+            result = super().write(vals)
+            self._invalidate_cohort_progress()
+        if counted:
+            self.env['event.event']._queue_participant_counters(self._get_counter_deltas())
+        return result
+
+    def unlink(self):
+        self._invalidate_cohort_progress()
+        self._invalidate_survey_tokens()
+        self.env['event.event']._queue_participant_counters(self._get_counter_deltas(sign=-1))
+        return super().unlink()
+
+    @api.model
+    def enroll_batch(self, event_id, rows):
+        """
+        Enroll many participants into an event in one go.
+
+        ``rows`` is a list of dicts with at least an ``email`` key and
+        optionally ``name``, ``team_lead_name`` and ``company_name``.
+        Emails are deduplicated (case-insensitive) against each other and
+        against the participants already enrolled in the event, all records
+        and their user_inputs are created with multi-creates, and the
+        invitations go through the mail queue instead of being sent inside
+        the request.
+
+        Returns a dict with the created participant ids and the skipped rows.
+        """
+        event = self._get_enrollment_event(event_id)
+        entries, skipped = self._prepare_enrollment_vals(event, rows, self._get_enrolled_emails(event))
+
+        participants = self.with_context(**BULK_CONTEXT).create([vals for _index, _email, vals in entries])
+        participants._post_bulk_summary("enrolled")
+        _logger.info("Enrolled %d participants in event %s (%d skipped)", len(participants), event.id, len(skipped))
+
+        return {
+            'created': participants.ids,
+            'skipped': skipped,
+        }
+
+    @api.model
+    def import_participants(self, event_id, rows, batch_size=None, first_row=0, send_invitations=True):
+        """
+        Enroll participants from an iterable of row dicts, e.g. a file
+        being parsed by ``inclue.participant.import``.
+
+        Rows are consumed lazily and created in batches of
+        ``inclue.import_batch_size`` (default 300), deduplicated against one
+        set of normalized emails. A batch that fails to create is retried
+        row by row so a bad row is reported instead of aborting the import.
+        Invitations are queued once every row has been created.
+
+        Returns a dict with the created participant ids and the skipped rows.
+        """
+        event = self._get_enrollment_event(event_id)
+        batch_size = batch_size or int(self.env['ir.config_parameter'].sudo().get_param('inclue.import_batch_size', 300))
+        seen = self._get_enrolled_emails(event)
+        Participant = self.with_context(inclue_defer_invitations=True, **BULK_CONTEXT)
+
+        created_ids = []
+        skipped = []
+        rows = iter(rows)
+        offset = first_row
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            entries, batch_skipped = self._prepare_enrollment_vals(event, batch, seen, offset)
+            skipped += batch_skipped
+            offset += len(batch)
+            created_ids += Participant._create_enrollment_batch(entries, skipped)
+            # Keep the cache from growing with the size of the file
+            self.env.invalidate_all()
+
+        if send_invitations:
+            for ids in split_every(batch_size, created_ids):
+                Participant.browse(ids).send_survey()
+                self.env.invalidate_all()
+
+        self.browse(created_ids)._post_bulk_summary("imported")
+        _logger.info("Imported %d participants in event %s (%d skipped)", len(created_ids), event.id, len(skipped))
+        return {
+            'created': created_ids,
+            'skipped': skipped,
+        }
+
+    @api.model
+    def _get_enrollment_event(self, event_id):
+        event = self.env['event.event'].browse(event_id).exists()
+        if not event:
+            raise UserError(f"Event {event_id} does not exist")
+        return event
+
+    @api.model
+    def _get_enrolled_emails(self, event):
+        """Normalized emails that cannot be enrolled in ``event`` again"""
+        # Skip people already in the event or already active in the journey
+        domain = [('event_id', '=', event.id)]
+        if event.cohort:
+            domain = ['|'] + domain + ['&', '&', ('cohort', '=', event.cohort),
+                                       ('facilitator_id', '=', event.facilitator_id.id), ('is_latest', '=', True)]
+        self.flush_model(['email_normalized', 'event_id', 'cohort', 'facilitator_id', 'is_latest'])
+        query = self._where_calc(domain)
+        query_str, params = query.select('"inclue_participant"."email_normalized"')
+        self.env.cr.execute(query_str, params)
+        return {row[0] for row in self.env.cr.fetchall() if row[0]}
+
+    @api.model
+    def _prepare_enrollment_vals(self, event, rows, seen, offset=0):
+        """Validate and deduplicate rows against ``seen``, which is updated in place
+
+        Returns ``(entries, skipped)`` where entries are
+        ``(row, email, vals)`` tuples ready to be created.
+        """
+        entries = []
+        skipped = []
+        for index, row in enumerate(rows, start=offset):
+            email = (row.get('email') or '').strip()
+            key = normalize_email(email)
+            if not email or '@' not in email:
+                skipped.append({'row': index, 'email': email, 'reason': 'Invalid email'})
+                continue
+            if key in seen:
+                skipped.append({'row': index, 'email': email, 'reason': 'Duplicate email'})
+                continue
+            seen.add(key)
+            entries.append((index, email, {
+                'name': row.get('name') or email.split('@')[0].title(),
+                'email': email,
+                'team_lead_name': row.get('team_lead_name') or 'TBD',
+                'company_name': row.get('company_name') or 'TBD',
+                'event_id': event.id,
+                'is_latest': True,
+            }))
+        return entries, skipped
+
+    @api.model
+    def _create_enrollment_batch(self, entries, skipped):
+        """Create one batch of enrollments, isolating the rows that fail"""
+        if not entries:
+            return []
+        try:
+            with self.env.cr.savepoint():
+                return self.create([vals for _index, _email, vals in entries]).ids
+        except Exception as e:
+            _logger.warning("Enrollment batch of %d rows failed, retrying row by row: %s", len(entries), str(e))
+
+        created_ids = []
+        for index, email, vals in entries:
+            try:
+                with self.env.cr.savepoint():
+                    created_ids.append(self.create(vals).id)
+            except Exception as e:
+                skipped.append({'row': index, 'email': email, 'reason': str(e)})
+        return created_ids
     
     @api.model
     def find_or_create_by_journey_code(self, journey_code, email):
@@ -102,51 +566,33 @@ class InclueParticipant(models.Model):
             return None, "Invalid journey code"
         
         # Find participant's current session in this journey
-        current_participant = self.search([
-            ('email', '=', email),
-            ('cohort', '=', kickoff_event.cohort),
-            ('is_latest', '=', True)
-        ], limit=1)
+        facilitator_id = kickoff_event.facilitator_id.id
+        progress = self.env['inclue.journey.progress']._get_progress(email, kickoff_event.cohort, facilitator_id)
+        current_participant = progress.participant_id
+        if not current_participant and kickoff_event.cohort:
+            # Journeys without a progress pointer yet
+            current_participant = self.search([
+                ('email_normalized', '=', normalize_email(email)),
+                ('cohort', '=', kickoff_event.cohort),
+                ('facilitator_id', '=', facilitator_id),
+                ('is_latest', '=', True),
+            ], limit=1)
         
         if current_participant:
             _logger.info(f"Found existing participant {current_participant.id} in {current_participant.session_type}")
             
             # Check if they've completed their current session
-            if current_participant.survey_completed:
+            if progress.survey_completed if progress else current_participant.survey_completed:
                 _logger.info(f"Participant {current_participant.id} completed {current_participant.session_type}, checking for next session")
                 
                 # Get next session type
                 next_session_type = self._get_next_session_type(current_participant.session_type)
                 
                 if next_session_type:
-                    # Find next session event in the same cohort
-                    next_event = self.env['event.event'].search([
-                        ('session_type', '=', next_session_type),
-                        ('cohort', '=', kickoff_event.cohort),
-                        ('is_inclue_event', '=', True),
-                        ('active', '=', True)
-                    ], limit=1)
-                    
+                    next_event = progress.next_event_id if progress else self._get_next_session_event(current_participant, next_session_type)
                     if next_event:
-                        # Check if participant already exists for next session
-                        existing_next_participant = self.search([
-                            ('email', '=', email),
-                            ('event_id', '=', next_event.id)
-                        ], limit=1)
-                        
-                        if existing_next_participant:
-                            # Update is_latest flags
-                            current_participant.is_latest = False
-                            existing_next_participant.is_latest = True
-                            _logger.info(f"Found existing participant {existing_next_participant.id} for {next_session_type}")
-                            return existing_next_participant, f"Advanced to {next_session_type} session"
-                        else:
-                            # Create new participant for next session
-                            new_participant = self._create_next_session_participant(current_participant, next_session_type)
-                            if new_participant:
-                                return new_participant, f"Advanced to {next_session_type} session"
-                            else:
-                                return current_participant, f"No {next_session_type} session available yet"
+                        new_participant = self._advance_to_event(current_participant, next_event)
+                        return new_participant, f"Advanced to {next_session_type} session"
                     else:
                         _logger.warning(f"No {next_session_type} event found in cohort {kickoff_event.cohort}")
                         return current_participant, f"No {next_session_type} session scheduled yet"
@@ -158,147 +604,756 @@ class InclueParticipant(models.Model):
                 _logger.info(f"Participant {current_participant.id} still needs to complete {current_participant.session_type}")
                 return current_participant, f"Continue {current_participant.session_type} session"
         
-        # No existing participant found - create new one in kickoff
-        _logger.info(f"Creating new participant for {email} in kickoff session")
-        new_participant = self.create({
+        # No existing participant found - enroll in kickoff, atomically
+        if not kickoff_event._reserve_participant_seats():
+            return None, "This journey is full, please contact your facilitator"
+        new_participant, created = self.with_context(
+            inclue_seat_reserved=kickoff_event.seats_limited)._upsert_enrollment(kickoff_event, email)
+        if not created:
+            if kickoff_event.seats_limited:
+                kickoff_event._unreserve_participant_seats()
+            _logger.info(f"Participant {new_participant.id} was enrolled in kickoff by a concurrent request")
+            return new_participant, f"Continue {new_participant.session_type} session"
+        
+        _logger.info(f"Created new participant {new_participant.id} for {email} in kickoff session")
+        return new_participant, "Started journey with kickoff session"
+
+    @api.model
+    def join_journey(self, journey_code, email):
+        """Join a journey by code in a transaction of its own
+
+        Entry point for people entering a journey code. The join runs in a
+        short READ COMMITTED transaction, committed before returning, so the
+        enrollment upsert sees rows committed by concurrent joins instead of
+        failing to serialize, and the queued invitation only becomes visible
+        to the queue cron once the enrollment is committed. Joins of the
+        same person wait for each other on an advisory lock.
+
+        The calling transaction may not see the participant yet, so plain
+        values are returned: ``participant_id``, ``session_type``,
+        ``survey_url`` and ``message``.
+        """
+        with self.pool.cursor() as cr:
+            cr.execute("SET TRANSACTION ISOLATION LEVEL READ COMMITTED")
+            cr.execute("SELECT pg_advisory_xact_lock(hashtext(%s))",
+                       (f"inclue_join:{(journey_code or '').strip().upper()}:{normalize_email(email)}",))
+            participant, message = self.with_env(self.env(cr=cr)).find_or_create_by_journey_code(journey_code, email)
+            return {
+                'participant_id': participant.id if participant else False,
+                'session_type': participant.session_type if participant else False,
+                'survey_url': participant.survey_url if participant else False,
+                'message': message,
+            }
+
+    @api.model
+    def _upsert_enrollment(self, event, email):
+        """Enroll ``email`` in ``event`` with a single INSERT ... ON CONFLICT
+
+        Concurrent enrollments of the same person in the same session all
+        get the one row that made it, instead of racing a search against a
+        create. Returns ``(participant, created)``. The invitation is
+        queued in the same transaction, so the queue cron only sends it
+        once the enrollment is committed.
+        """
+        email = email.strip()
+        vals = {
             'name': email.split('@')[0].title(),
             'email': email,
-            'event_id': kickoff_event.id,
+            'event_id': event.id,
             'team_lead_name': 'TBD',
             'company_name': 'TBD',
-            'is_latest': True
-        })
-        
-        return new_participant, "Started journey with kickoff session"
+            'is_latest': True,
+        }
+        if not event.cohort:
+            # The unique enrollment index cannot match without a cohort
+            return self.create(vals), True
+
+        self.flush_model()
+        event.flush_recordset(['cohort', 'session_type', 'facilitator_id', 'survey_id', 'journey_code'])
+        now = fields.Datetime.now()
+        try:
+            with self.env.cr.savepoint():
+                participant_id, created = self._insert_enrollment(event, vals, now)
+        except psycopg2.errors.InvalidColumnReference:
+            # Unique index missing until cron_merge_duplicates cleaned the duplicates
+            _logger.warning("Unique enrollment index missing, enrolling %s without upsert", email)
+            return self.create(vals), True
 
+        participant = self.browse(participant_id)
+        if created:
+            participant._finalize_enrollment()
+        return participant, created
 
-    @api.depends('user_input_id.state')
-    def _compute_survey_state(self):
-        """Sync survey state with user_input state and update related fields"""
+    @api.model
+    def _insert_enrollment(self, event, vals, now):
+        self.env.cr.execute("""
+            INSERT INTO inclue_participant
+                   (name, email, email_normalized, team_lead_name, company_name,
+                    event_id, cohort, session_type, facilitator_id, survey_id, journey_code,
+                    is_latest, active, survey_sent, survey_started, survey_completed, survey_state,
+                    date_sent, reminder_count, create_uid, write_uid, create_date, write_date)
+            VALUES (%s, %s, %s, %s, %s,
+                    %s, %s, %s, %s, %s, %s,
+                    TRUE, TRUE, TRUE, FALSE, FALSE, 'new',
+                    %s, 0, %s, %s, %s, %s)
+            ON CONFLICT (email_normalized, cohort, session_type, (COALESCE(facilitator_id, 0))) WHERE active
+            DO UPDATE SET write_date = inclue_participant.write_date
+            RETURNING id, xmax = 0
+        """, (
+            vals['name'], vals['email'], normalize_email(vals['email']),
+            vals['team_lead_name'], vals['company_name'],
+            event.id, event.cohort, event.session_type, event.facilitator_id.id or None,
+            event.survey_id.id or None, event.journey_code or None,
+            now, self.env.uid, self.env.uid, now, now,
+        ))
+        return self.env.cr.fetchone()
+
+
+    def _compute_journey_timeline_html(self):
+        timelines = self.get_journey_timeline(self.filtered('id').ids)
+        session_labels = dict(self._fields['session_type']._description_selection(self.env))
+        state_labels = dict(self._fields['survey_state']._description_selection(self.env))
         for rec in self:
-            if rec.user_input_id:
-                rec.survey_state = rec.user_input_id.state
-                
-                if rec.user_input_id.state == 'in_progress':
-                    if not rec.survey_started:
-                        rec.survey_started = True
-                        rec.date_started = fields.Datetime.now()
-                    rec.survey_completed = False
-                    
-                elif rec.user_input_id.state == 'done':
-                    rec.survey_started = True
-                    if not rec.survey_completed:
-                        rec.survey_completed = True
-                        rec.date_completed = fields.Datetime.now()
-                        
-                else:
-                    rec.survey_started = False
-                    rec.survey_completed = False
-            else:
-                rec.survey_state = 'new'
-    
-    @api.depends('survey_id', 'user_input_id')
+            rows = Markup('').join(
+                Markup('<tr><td>%s</td><td>%s</td><td>%s</td><td>%s</td></tr>') % (
+                    session_labels.get(step['session_type'], step['session_type'] or ''),
+                    fields.Datetime.to_string(step['session_date']) or '',
+                    state_labels.get(step['survey_state'], step['survey_state'] or ''),
+                    fields.Datetime.to_string(step['date_completed']) or '',
+                )
+                for step in timelines.get(rec.id, [])
+            )
+            rec.journey_timeline_html = Markup(
+                '<table class="table table-sm"><thead><tr><th>Session</th><th>Date</th>'
+                '<th>Survey</th><th>Completed</th></tr></thead><tbody>%s</tbody></table>'
+            ) % rows
+
+    @api.model
+    def get_journey_timeline(self, participant_ids):
+        """Return the ordered session steps of each participant's journey
+
+        ``{participant_id: [{'participant_id', 'event_id', 'session_type',
+        'session_date', 'survey_state', 'date_sent', 'date_started',
+        'date_completed'}, ...]}``, fetched with one recursive query.
+        """
+        self.check_access_rights('read')
+        participant_ids = self.browse(participant_ids)._filter_access_rules('read').ids
+        self.flush_model(['previous_participant_id', 'event_id', 'session_type', 'survey_state',
+                          'date_sent', 'date_started', 'date_completed'])
+        self.env['event.event'].flush_model(['date_begin'])
+        return fetch_journey_timeline(self.env.cr, participant_ids)
+
+    @api.depends('email')
+    def _compute_email_normalized(self):
+        for rec in self:
+            rec.email_normalized = normalize_email(rec.email) if rec.email else False
+
+    def init(self):
+        # Version of the survey token caches of all workers
+        self.env.cr.execute(f"CREATE SEQUENCE IF NOT EXISTS {SURVEY_TOKEN_VERSION_SEQUENCE}")
+        # Composite indexes matching the participant lookup domains
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS inclue_participant_email_event_idx
+                ON inclue_participant (email_normalized, event_id)
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS inclue_participant_email_session_idx
+                ON inclue_participant (email_normalized, session_type)
+        """)
+        # Candidates of cron_create_followup_sessions, walked in id order; finished
+        # journeys stay latest and completed forever, so the last session is left out
+        self.env.cr.execute("DROP INDEX IF EXISTS inclue_participant_followup_due_idx")
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS inclue_participant_followup_candidate_idx
+                ON inclue_participant (id)
+             WHERE is_latest AND survey_completed AND session_type <> 'followup6'
+        """)
+        # Public survey links are resolved by access token
+        try:
+            with self.env.cr.savepoint():
+                self.env.cr.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS inclue_participant_access_token_uniq
+                        ON inclue_participant (access_token)
+                     WHERE access_token IS NOT NULL
+                """)
+        except Exception as e:
+            _logger.error("Could not create unique access_token index, duplicate tokens must be fixed first: %s", str(e))
+        # Candidates of cron_send_reminders, ordered by the date they fall due; only
+        # the current session of a journey, only with a link to send, and only until
+        # the last reminder went out so abandoned surveys leave the index
+        max_reminders = int(self.env['ir.config_parameter'].sudo().get_param('inclue.reminder_max_count', 3))
+        self.env.cr.execute("""
+            UPDATE inclue_participant
+               SET reminders_exhausted = TRUE
+             WHERE COALESCE(reminder_count, 0) >= %s
+               AND reminders_exhausted IS NOT TRUE
+        """, (max_reminders,))
+        self.env.cr.execute("DROP INDEX IF EXISTS inclue_participant_reminder_due_idx")
+        self.env.cr.execute("DROP INDEX IF EXISTS inclue_participant_reminder_candidate_idx")
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS inclue_participant_reminder_open_idx
+                ON inclue_participant ((COALESCE(last_reminder_at, date_sent)), id)
+             WHERE survey_state IN ('new', 'in_progress') AND active AND is_latest AND survey_path IS NOT NULL
+               AND reminders_exhausted IS NOT TRUE
+        """)
+        # One active participant per person and journey session, arbiter of _upsert_enrollment
+        try:
+            with self.env.cr.savepoint():
+                self.env.cr.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS inclue_participant_enrollment_uniq
+                        ON inclue_participant (email_normalized, cohort, session_type, (COALESCE(facilitator_id, 0)))
+                     WHERE active
+                """)
+        except Exception as e:
+            _logger.error("Could not create unique enrollment index, run cron_merge_duplicates first: %s", str(e))
+        # Duplicate groups of cron_merge_duplicates, walked in key order
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS inclue_participant_duplicate_key_idx
+                ON inclue_participant (email_normalized, cohort, session_type, (COALESCE(facilitator_id, 0)))
+             WHERE active
+        """)
+        # One latest participant per person and journey, also serves the is_latest
+        # lookups; cohort names are numbered per facilitator. Checked per statement:
+        # writers flush the demoted rows before inserting or promoting the next ones
+        self.env.cr.execute("DROP INDEX IF EXISTS inclue_participant_latest_uniq")
+        try:
+            with self.env.cr.savepoint():
+                self.env.cr.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS inclue_participant_journey_latest_uniq
+                        ON inclue_participant (email_normalized, cohort, (COALESCE(facilitator_id, 0)))
+                     WHERE is_latest
+                """)
+        except Exception as e:
+            _logger.error("Could not create unique is_latest index, duplicate latest participants must be fixed first: %s", str(e))
+
+    @api.model
+    def _check_lookup_index_usage(self):
+        """EXPLAIN the participant lookup domains and report whether they hit an index
+
+        Sequential scans are disabled for the check so the result does not
+        depend on the current table size.
+        """
+        sample = self.search([], limit=1)
+        email = sample.email_normalized or 'check@example.com'
+        cohort = sample.cohort or 'Journey1'
+        event_id = sample.event_id.id or 0
+        domains = {
+            'find_or_create_by_journey_code': [('email_normalized', '=', email), ('cohort', '=', cohort),
+                                               ('facilitator_id', '=', sample.facilitator_id.id), ('is_latest', '=', True)],
+            'get_participant_by_email': [('email_normalized', '=', email), ('is_latest', '=', True)],
+            '_create_next_session_participant': [('email_normalized', '=', email), ('event_id', '=', event_id)],
+            'session_lookup': [('email_normalized', '=', email), ('session_type', '=', 'kickoff')],
+        }
+
+        results = {}
+        self.flush_model()
+        self.env.cr.execute("SET LOCAL enable_seqscan = off")
+        try:
+            for name, domain in domains.items():
+                query_str, params = self._where_calc(domain).select('"inclue_participant"."id"')
+                self.env.cr.execute("EXPLAIN " + query_str, params)
+                plan = "\n".join(row[0] for row in self.env.cr.fetchall())
+                results[name] = 'Index' in plan
+                if not results[name]:
+                    _logger.warning("Lookup %s does not use an index:\n%s", name, plan)
+        finally:
+            self.env.cr.execute("RESET enable_seqscan")
+        return results
+
+    @api.depends('survey_path', 'survey_id.access_token', 'user_input_id.access_token')
     def _compute_survey_url(self):
-        base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
+        base_url = self.env['ir.config_parameter']._get_inclue_base_url()
         for rec in self:
-            if rec.survey_id and rec.user_input_id:
-                rec.survey_url = f"{base_url}/survey/inclue/{rec.survey_id.access_token}/{rec.user_input_id.access_token}"
-                _logger.info(f"Generated custom URL: {rec.survey_url}")
-            else:
-                rec.survey_url = False
+            survey_path = rec._get_survey_path()
+            rec.survey_url = f"{base_url}{survey_path}" if survey_path else False
+
+    def _get_survey_path(self):
+        """Stored survey path, or the one built from the survey and response tokens
+
+        Participants created before the path was stored only have the tokens.
+        """
+        self.ensure_one()
+        if self.survey_path:
+            return self.survey_path
+        if self.survey_id.access_token and self.user_input_id.access_token:
+            return f"/survey/inclue/{self.survey_id.access_token}/{self.user_input_id.access_token}"
+        return False
   
+    @api.model
+    @tools.ormcache('session_type', 'lang')
+    def _get_invitation_template(self, session_type, lang):
+        """Compile the invitation body once per (session_type, language)
+
+        The result is kept in the registry cache; only the per-participant
+        placeholders are left to substitute at send time.
+        """
+        selection = self.with_context(lang=lang)._fields['session_type']._description_selection(self.with_context(lang=lang).env)
+        session_label = dict(selection).get(session_type) or session_type or ''
+        body = SURVEY_INVITATION_BODY.replace('$session_label', escape(session_label).replace('$', '$$'))
+        return string.Template(body)
+
+    def _prepare_invitation_mail_values(self, subject=None):
+        """Render the survey invitation for the whole recordset in one pass"""
+        default_lang = self.env.lang or 'en_US'
+        mail_values = []
+        for participant in self:
+            lang = participant.event_id.language_id.code or default_lang
+            template = self._get_invitation_template(participant.session_type or '', lang)
+            body = template.safe_substitute(
+                name=escape(participant.name or ''),
+                survey_url=escape(participant.survey_url or ''),
+                event_name=escape(participant.event_id.name or ''),
+                facilitator_name=escape(participant.facilitator_id.name or ''),
+                team_lead_name=escape(participant.team_lead_name or ''),
+                company_name=escape(participant.company_name or ''),
+            )
+            mail_values.append({
+                'subject': subject or 'Your iN-Clue Journey Survey',
+                'email_from': 'noreply@inclue.com',
+                'email_to': participant.email,
+                'body_html': body,
+                'model': self._name,
+                'res_id': participant.id,
+                'auto_delete': False,
+            })
+        return mail_values
+
     def send_survey(self):
-        """Send survey email to participant"""
-        self.ensure_one()
-        
-        template = self.env['mail.template'].create({
-            'name': 'iN-Clue Survey Invitation',
-            'model_id': self.env['ir.model'].search([('model', '=', 'inclue.participant')], limit=1).id,
-            'subject': 'Your iN-Clue Journey Survey',
-            'email_from': 'noreply@inclue.com',
-            'email_to': self.email,
-            'body_html': '''
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <div style="background-color: #008f8c; color: white; padding: 20px; text-align: center;">
-                        <h1 style="margin: 0;">iN-Clue Journey</h1>
-                    </div>
-                    
-                    <div style="padding: 20px; background-color: #f9f9f9;">
-                        <p>Dear <t t-out="object.name"/>,</p>
-                        
-                        <p>Thank you for participating in the <strong><t t-out="object.session_type"/></strong> session of the iN-Clue Journey.</p>
-                        
-                        <p>Please take a moment to complete your survey by clicking the button below:</p>
-                        
-                        <div style="text-align: center; margin: 30px 0;">
-                            <a t-att-href="object.survey_url" 
-                            style="background-color: #008f8c; 
-                                    color: white; 
-                                    padding: 12px 30px; 
-                                    text-decoration: none; 
-                                    border-radius: 5px; 
-                                    display: inline-block;
-                                    font-weight: bold;">
-                                Complete Survey
-                            </a>
-                        </div>
-                        
-                        <p><strong>Session Details:</strong></p>
-                        <ul style="list-style: none; padding-left: 0;">
-                            <li>📅 Event: <t t-out="object.event_id.name"/></li>
-                            <li>👤 Facilitator: <t t-out="object.facilitator_id.name"/></li>
-                            <li>👥 Team Lead: <t t-out="object.team_lead_name"/></li>
-                            <li>🏢 Company: <t t-out="object.company_name"/></li>
-                        </ul>
-                        
-                        <p>This survey link is unique to you and requires no login.</p>
-                        
-                        <p>Thank you for your participation!</p>
-                        
-                        <p>Best regards,<br/>The iN-Clue Team</p>
-                    </div>
-                    
-                    <div style="background-color: #333; color: white; padding: 10px; text-align: center; font-size: 12px;">
-                        <p style="margin: 0;">© 2024 iN-Clue Journey. All rights reserved.</p>
-                    </div>
-                </div>
-            ''',
-            'auto_delete': False,
-        })
+        """Queue the survey email for participants
+
+        Mails go through ``inclue.mail.queue``; use the ``inclue_mail_sync``
+        context key to send them immediately. Participants whose invitation
+        was deferred are marked as sent once it is queued.
+        """
+        if not self:
+            return False
         
         try:
-            mail_id = template.send_mail(self.id, force_send=True)
-            template.unlink()
+            self.env['inclue.mail.queue'].enqueue_mail(self._prepare_invitation_mail_values())
+            self.filtered(lambda p: not p.survey_sent).write({
+                'survey_sent': True,
+                'date_sent': fields.Datetime.now(),
+            })
             return True
         except Exception as e:
-            _logger.error(f"Failed to send survey to {self.email}: {str(e)}")
+            _logger.error(f"Failed to send survey to {', '.join(self.mapped('email'))}: {str(e)}")
             return False
 
     @api.model
-    def get_participant_by_email(self, email):
-        """Get the appropriate participant record for an email"""
-        latest_completed = self.search([
-            ('email', '=', email),
-            ('survey_completed', '=', True),
-            ('is_latest', '=', True)
-        ], limit=1)
+    def cron_send_reminders(self):
+        """
+        Cron job: remind participants whose survey is still open
+        ``inclue.reminder_delay_days`` days after it was sent, or after
+        their last reminder.
+
+        Only the current session of each journey is reminded, and only
+        when it has a survey link. Due participants are read from a
+        partial index in capped batches; each batch is rendered in one
+        pass, enqueued at once and stamped with ``last_reminder_at`` before
+        the commit, so a second run on the same day does not select them
+        again. Participants who got their last reminder are flagged
+        ``reminders_exhausted``, which takes them out of the index.
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        delay_days = max(1, int(ICP.get_param('inclue.reminder_delay_days', 3)))
+        max_reminders = int(ICP.get_param('inclue.reminder_max_count', 3))
+        batch_size = int(ICP.get_param('inclue.reminder_batch_size', 100))
+        max_batches = int(ICP.get_param('inclue.reminder_max_batches', 10))
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
         
-        _logger.info(f"Latest completed participant for {email}: {latest_completed.id if latest_completed else 'None'}")
-        if latest_completed:
-            next_session = self._get_next_session_type(latest_completed.session_type)
-            if next_session:
-                next_participant = self.search([
-                    ('email', '=', email),
-                    ('session_type', '=', next_session)
-                ], limit=1)
-                
-                if next_participant:
-                    return next_participant
-                else:
-                    return self._create_next_session_participant(latest_completed, next_session)
+        cutoff = fields.Datetime.now() - timedelta(days=delay_days)
+        reminded = 0
+        for _ in range(max_batches):
+            self.flush_model(['survey_state', 'date_sent', 'last_reminder_at', 'reminder_count', 'reminders_exhausted',
+                              'is_latest', 'survey_path'])
+            self.env.cr.execute("""
+                SELECT id FROM inclue_participant
+                 WHERE survey_state IN ('new', 'in_progress')
+                   AND active
+                   AND is_latest
+                   AND survey_path IS NOT NULL
+                   AND reminders_exhausted IS NOT TRUE
+                   AND COALESCE(last_reminder_at, date_sent) <= %s
+                   AND COALESCE(reminder_count, 0) < %s
+                   AND email IS NOT NULL
+                 ORDER BY COALESCE(last_reminder_at, date_sent), id
+                 LIMIT %s
+            """, (cutoff, max_reminders, batch_size))
+            participants = self.browse([row[0] for row in self.env.cr.fetchall()])
+            if not participants:
+                break
+            
+            try:
+                with self.env.cr.savepoint():
+                    self.env['inclue.mail.queue'].enqueue_mail(
+                        participants._prepare_invitation_mail_values(subject='Reminder: Your iN-Clue Journey Survey'))
+                    self.env.cr.execute("""
+                        UPDATE inclue_participant
+                           SET last_reminder_at = now() at time zone 'UTC',
+                               reminder_count = COALESCE(reminder_count, 0) + 1,
+                               reminders_exhausted = COALESCE(reminder_count, 0) + 1 >= %s
+                         WHERE id IN %s
+                    """, (max_reminders, tuple(participants.ids)))
+                    participants.invalidate_recordset(['last_reminder_at', 'reminder_count', 'reminders_exhausted'])
+            except Exception as e:
+                # Stop here rather than selecting the same batch again
+                _logger.error(f"Failed to queue reminders for participants {participants.ids}: {str(e)}")
+                break
+            
+            reminded += len(participants)
+            if auto_commit:
+                self.env.cr.commit()
         
+        _logger.info("Reminder cron: queued %d survey reminders", reminded)
+        return reminded
+
+    @api.model
+    def cron_merge_duplicates(self):
+        """
+        Maintenance job: merge participants enrolled more than once in the
+        same session of a journey (same normalized email, cohort, session
+        type and facilitator).
+
+        Duplicate groups come from one grouped query walked in key order,
+        a bounded number of groups per chunk with a commit per chunk, so
+        locks are held briefly. In each group the participant with the most
+        advanced survey_state survives; previous_participant_id chains,
+        journey progress pointers and a missing user_input are moved to it
+        with set-based updates, and the other participants are archived
+        with ``merged_into_id`` pointing at the survivor.
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        chunk_size = int(ICP.get_param('inclue.merge_chunk_size', 500))
+        max_chunks = int(ICP.get_param('inclue.merge_max_chunks', 20))
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+
+        self.flush_model()
+        self.env['inclue.journey.progress'].flush_model()
+        cr = self.env.cr
+        last_key = ('', '', '', 0)
+        merged = 0
+        cohorts = set()
+        for _ in range(max_chunks):
+            cr.execute("""
+                SELECT email_normalized, cohort, session_type, COALESCE(facilitator_id, 0),
+                       ARRAY_AGG(id ORDER BY CASE survey_state WHEN 'done' THEN 0
+                                                               WHEN 'in_progress' THEN 1
+                                                               ELSE 2 END,
+                                             is_latest DESC, user_input_id IS NULL, id)
+                  FROM inclue_participant
+                 WHERE active
+                   AND email_normalized IS NOT NULL
+                   AND cohort IS NOT NULL
+                   AND session_type IS NOT NULL
+                   AND (email_normalized, cohort, session_type, COALESCE(facilitator_id, 0)) > (%s, %s, %s, %s)
+                 GROUP BY email_normalized, cohort, session_type, COALESCE(facilitator_id, 0)
+                HAVING COUNT(*) > 1
+                 ORDER BY email_normalized, cohort, session_type, COALESCE(facilitator_id, 0)
+                 LIMIT %s
+            """, last_key + (chunk_size,))
+            groups = cr.fetchall()
+            if not groups:
+                break
+            last_key = groups[-1][:4]
+
+            pairs = [(loser_id, ids[0]) for *_key, ids in groups for loser_id in ids[1:]]
+            values_sql = ', '.join(["(%s, %s)"] * len(pairs))
+            merge_map = f"(VALUES {values_sql}) AS m (loser_id, survivor_id)"
+            params = [value for pair in pairs for value in pair]
+            try:
+                with cr.savepoint():
+                    # Losers first: the unique is_latest index allows one latest row per journey
+                    cr.execute(f"""
+                        WITH losers AS (
+                            SELECT p.id, m.survivor_id, p.is_latest, p.event_id, p.survey_state
+                              FROM inclue_participant p
+                              JOIN {merge_map} ON m.loser_id = p.id
+                        )
+                        UPDATE inclue_participant p
+                           SET active = FALSE,
+                               is_latest = FALSE,
+                               merged_into_id = losers.survivor_id,
+                               write_uid = %s,
+                               write_date = now() at time zone 'UTC'
+                          FROM losers
+                         WHERE p.id = losers.id
+                     RETURNING losers.survivor_id, losers.is_latest, losers.event_id, losers.survey_state
+                    """, params + [self.env.uid])
+                    archived = cr.fetchall()
+                    promoted = list({survivor_id for survivor_id, was_latest, _event, _state in archived if was_latest})
+                    if promoted:
+                        cr.execute("UPDATE inclue_participant SET is_latest = TRUE WHERE id = ANY(%s)", (promoted,))
+                    cr.execute(f"""
+                        UPDATE inclue_participant p
+                           SET previous_participant_id = m.survivor_id
+                          FROM {merge_map}
+                         WHERE p.previous_participant_id = m.loser_id
+                    """, params)
+                    cr.execute(f"""
+                        UPDATE inclue_participant s
+                           SET user_input_id = l.user_input_id,
+                               survey_path = l.survey_path
+                          FROM {merge_map}
+                          JOIN inclue_participant l ON l.id = m.loser_id
+                         WHERE s.id = m.survivor_id
+                           AND s.user_input_id IS NULL
+                           AND l.user_input_id IS NOT NULL
+                    """, params)
+                    cr.execute(f"""
+                        UPDATE inclue_journey_progress jp
+                           SET participant_id = m.survivor_id
+                          FROM {merge_map}
+                         WHERE jp.participant_id = m.loser_id
+                    """, params)
+            except Exception as e:
+                _logger.error("Failed to merge %d duplicate participants: %s", len(pairs), str(e))
+                continue
+
+            deltas = {}
+            for _survivor, _latest, event_id, state in archived:
+                delta = deltas.setdefault(event_id, [0, 0, 0])
+                delta[0] -= 1
+                delta[1] -= state in ('in_progress', 'done')
+                delta[2] -= state == 'done'
+            self.env['event.event']._queue_participant_counters(deltas)
+            merged += len(pairs)
+            cohorts.update(group[1] for group in groups)
+            if auto_commit:
+                cr.commit()
+
+        if merged:
+            self.invalidate_model()
+            self.env['inclue.journey.progress'].invalidate_model()
+            dbname = cr.dbname
+            for cohort in cohorts:
+                _cohort_progress_cache.pop((dbname, cohort), None)
+            # Cached links of the archived duplicates now lead to the survivors
+            _queue_cache_version_bump(cr, SURVEY_TOKEN_VERSION_SEQUENCE)
+        _logger.info("Duplicate merge: archived %d duplicate participants in %d cohorts", merged, len(cohorts))
+        return merged
+
+    @api.model
+    def get_cohort_progress(self, cohorts):
+        """Return participant counts per session type and survey state
+
+        ``{cohort: {session_type: {'new': n, 'in_progress': n, 'done': n}}}``
+        """
+        return self._get_cohort_progress(cohorts)[0]
+
+    @api.model
+    def _get_cohort_progress(self, cohorts):
+        """Cohort counts and their combined ETag, served from a short-TTL cache
+
+        Cache misses are aggregated with a single grouped query on the
+        stored cohort, session_type and survey_state columns. The counts
+        follow the record rules of the current user, so they are cached and
+        tagged per user.
+        """
+        self.check_access_rights('read')
+        dbname = self.env.cr.dbname
+        user_key = (self.env.uid, self.env.su)
+        now = time.monotonic()
+
+        result = {}
+        etags = {}
+        missing = []
+        for cohort in cohorts:
+            cached = _cohort_progress_cache.get((dbname, cohort), {}).get(user_key)
+            if cached and cached[0] > now:
+                result[cohort], etags[cohort] = cached[1], cached[2]
+            else:
+                missing.append(cohort)
+
+        if missing:
+            counts = {cohort: {} for cohort in missing}
+            groups = self.read_group(
+                [('cohort', 'in', missing)],
+                ['cohort', 'session_type', 'survey_state'],
+                ['cohort', 'session_type', 'survey_state'],
+                lazy=False,
+            )
+            for group in groups:
+                states = counts[group['cohort']].setdefault(
+                    group['session_type'] or 'none', {'new': 0, 'in_progress': 0, 'done': 0})
+                states[group['survey_state'] or 'new'] += group['__count']
+
+            for cohort, cohort_counts in counts.items():
+                etag = hashlib.sha1(json.dumps([user_key, cohort_counts], sort_keys=True).encode()).hexdigest()
+                _cohort_progress_cache.setdefault((dbname, cohort), {})[user_key] = (
+                    now + COHORT_PROGRESS_TTL, cohort_counts, etag)
+                result[cohort], etags[cohort] = cohort_counts, etag
+
+        etag = hashlib.sha1('|'.join(f"{cohort}:{etags[cohort]}" for cohort in sorted(etags)).encode()).hexdigest()
+        return result, etag
+
+    def _invalidate_cohort_progress(self):
+        dbname = self.env.cr.dbname
+        for cohort in set(self.sudo().mapped('cohort')):
+            _cohort_progress_cache.pop((dbname, cohort), None)
+
+    @api.model
+    def _get_export_query(self, company=None, cohort=None, facilitator_id=None, date_from=None, date_to=None):
+        """SQL and parameters of the participant export for the given filters
+
+        The projection is fixed to ``EXPORT_COLUMNS`` and only reads stored
+        columns, so rows can be streamed from a server-side cursor without
+        loading any record. Access rules of the current user are applied.
+        """
+        self.check_access_rights('read')
+        domain = []
+        if company:
+            domain.append(('company_name', '=ilike', company))
+        if cohort:
+            domain.append(('cohort', '=', cohort))
+        if facilitator_id:
+            domain.append(('facilitator_id', '=', int(facilitator_id)))
+        if date_from:
+            domain.append(('event_id.date_begin', '>=', fields.Datetime.to_datetime(date_from)))
+        if date_to:
+            domain.append(('event_id.date_begin', '<=', fields.Datetime.to_datetime(date_to)))
+
+        self.flush_model()
+        self.env['event.event'].flush_model(['name', 'date_begin'])
+        self.env['res.partner'].flush_model(['name'])
+        query = self._where_calc(domain)
+        self._apply_ir_rules(query, 'read')
+        query.left_join('inclue_participant', 'event_id', 'event_event', 'id', 'event_id')
+        query.left_join('inclue_participant', 'facilitator_id', 'res_partner', 'id', 'facilitator_id')
+        query.order = '"inclue_participant"."id"'
+        return query.select(*(f'{expression} AS "{column}"' for column, expression in EXPORT_COLUMNS))
+
+    @api.model
+    def _get_survey_token_entry(self, token):
+        """Return ``(participant id, survey token, user_input token)`` for a participant access token
+
+        Served from a bounded per-worker LRU keyed on the token cache
+        version, so a hit costs one read of the version sequence and a miss
+        one more query on the unique access_token index. Unknown tokens are
+        not cached.
+        """
+        key = (self.env.cr.dbname, _get_cache_version(self.env.cr, SURVEY_TOKEN_VERSION_SEQUENCE), token)
+        entry = _survey_token_cache.get(key)
+        if entry:
+            return entry
+
+        self.flush_model(['access_token', 'survey_id', 'user_input_id', 'merged_into_id'])
+        # Links of merged duplicates lead to the surviving participant
+        self.env.cr.execute("""
+            SELECT COALESCE(m.id, p.id), s.access_token, ui.access_token
+              FROM inclue_participant p
+              LEFT JOIN inclue_participant m ON m.id = p.merged_into_id
+              LEFT JOIN survey_survey s ON s.id = COALESCE(m.survey_id, p.survey_id)
+              LEFT JOIN survey_user_input ui ON ui.id = COALESCE(m.user_input_id, p.user_input_id)
+             WHERE p.access_token = %s
+        """, (token,))
+        entry = self.env.cr.fetchone()
+        if entry and entry[1] and entry[2]:
+            _survey_token_cache[key] = entry
+        return entry
+
+    def _get_or_create_user_input_token(self):
+        """Return the access token of the participant's survey.user_input, creating it on the first click
+
+        The lock and the creation run in a short READ COMMITTED transaction
+        of their own, committed before returning. Concurrent first clicks on
+        a lazy link wait on the participant row lock, then read the
+        user_input committed by the first click and reuse it instead of
+        failing to serialize. The caller's transaction may not see the new
+        user_input, hence the token is returned rather than the record.
+        """
+        self.ensure_one()
+        self.flush_recordset()
+        with self.pool.cursor() as cr:
+            cr.execute("SET TRANSACTION ISOLATION LEVEL READ COMMITTED")
+            cr.execute("""
+                SELECT ui.access_token
+                  FROM inclue_participant p
+                  LEFT JOIN survey_user_input ui ON ui.id = p.user_input_id
+                 WHERE p.id = %s
+                   FOR UPDATE OF p
+            """, (self.id,))
+            row = cr.fetchone()
+            if row and row[0]:
+                return row[0]
+
+            participant = self.with_env(self.env(cr=cr))
+            survey_token = participant.survey_id.access_token
+            start = time.monotonic()
+            user_input = participant.env['survey.user_input'].create({
+                'survey_id': participant.survey_id.id,
+                'access_token': participant.access_token or str(uuid.uuid4()),
+                'email': participant.email,
+                'nickname': participant.name,
+                'state': 'new',
+            })
+            token = user_input.access_token
+            participant.write({
+                'user_input_id': user_input.id,
+                'access_token': token,
+                'survey_path': f"/survey/inclue/{survey_token}/{token}",
+            })
+        _record_user_input_creation(1, time.monotonic() - start)
+        key = (self.env.cr.dbname, _get_cache_version(self.env.cr, SURVEY_TOKEN_VERSION_SEQUENCE), token)
+        _survey_token_cache[key] = (self.id, survey_token, token)
+        return token
+
+    @api.model
+    def get_user_input_savings(self, cohorts):
+        """Rows and write time saved per cohort by the lazy user_input mode
+
+        ``{cohort: {'participants', 'user_inputs', 'rows_saved', 'write_ms_saved'}}``.
+        Rows saved are the survey links never opened; the time is estimated
+        from the user_input creations measured by this worker, or None
+        before any was measured.
+        """
+        self.check_access_rights('read')
+        self.flush_model(['cohort', 'access_token', 'user_input_id', 'active'])
+        self.env.cr.execute("""
+            SELECT cohort, COUNT(*), COUNT(user_input_id)
+              FROM inclue_participant
+             WHERE cohort = ANY(%s)
+               AND active
+               AND access_token IS NOT NULL
+             GROUP BY cohort
+        """, (list(cohorts),))
+        created, seconds = _user_input_create_stats
+        per_row_ms = seconds * 1000 / created if created else None
+
+        savings = {}
+        for cohort, participants, user_inputs in self.env.cr.fetchall():
+            rows_saved = participants - user_inputs
+            savings[cohort] = {
+                'participants': participants,
+                'user_inputs': user_inputs,
+                'rows_saved': rows_saved,
+                'write_ms_saved': round(rows_saved * per_row_ms, 1) if per_row_ms is not None else None,
+            }
+        return savings
+
+    def _invalidate_survey_tokens(self):
+        """Drop the cached links of participants whose token, survey or response changes"""
+        cached = self.filtered(lambda p: p.access_token and p.user_input_id)
+        if not cached:
+            return
+        key = (self.env.cr.dbname, _get_cache_version(self.env.cr, SURVEY_TOKEN_VERSION_SEQUENCE))
+        for token in cached.mapped('access_token'):
+            try:
+                _survey_token_cache.pop(key + (token,))
+            except KeyError:
+                pass
+        # The other workers miss their entries once the new version is committed
+        _queue_cache_version_bump(self.env.cr, SURVEY_TOKEN_VERSION_SEQUENCE)
+
+    @api.model
+    def get_participant_by_email(self, email):
+        """Get the appropriate participant record for an email"""
+        participant = self.env['inclue.journey.progress']._resolve_participant(email)
+        if participant:
+            return participant
+
+        # Journeys without a progress pointer yet
         existing_participant = self.search([
-            ('email', '=', email),
+            ('email_normalized', '=', normalize_email(email)),
             ('is_latest', '=', True)
         ], limit=1)
         
@@ -308,44 +1363,248 @@ class InclueParticipant(models.Model):
     
     def _get_next_session_type(self, current_session):
         """Get the next session type in sequence"""
-        sequence = ['kickoff', 'followup1', 'followup2', 'followup3', 
-                   'followup4', 'followup5', 'followup6']
         try:
-            current_index = sequence.index(current_session)
-            if current_index < len(sequence) - 1:
-                return sequence[current_index + 1]
+            current_index = SESSION_SEQUENCE.index(current_session)
+            if current_index < len(SESSION_SEQUENCE) - 1:
+                return SESSION_SEQUENCE[current_index + 1]
         except ValueError:
             pass
         return None
     
-    def _create_next_session_participant(self, previous_participant, next_session_type):
-        """Create NEW participant for next session IN SAME COHORT"""
-        # Find next session event IN THE SAME COHORT (this is the key change!)
-        next_event = self.env['event.event'].search([
+    def _get_next_session_event(self, previous_participant, next_session_type):
+        """Find the next session event of the participant's journey (same cohort and facilitator)"""
+        return self.env['event.event'].search([
             ('session_type', '=', next_session_type),
             ('cohort', '=', previous_participant.cohort),  # SAME COHORT!
             ('facilitator_id', '=', previous_participant.facilitator_id.id)
         ], limit=1)
+
+    def _create_next_session_participant(self, previous_participant, next_session_type):
+        """Create NEW participant for next session IN SAME COHORT"""
+        next_event = self._get_next_session_event(previous_participant, next_session_type)
         
         if not next_event:
             _logger.warning(f"No event found for session type '{next_session_type}' in cohort '{previous_participant.cohort}'")
             return None
         
-        previous_participant.sudo().write({'is_latest': False})
-        
-        # Your existing participant creation logic stays exactly the same
-        new_participant = self.create({
-            'name': previous_participant.name,
-            'email': previous_participant.email,
-            'team_lead_name': previous_participant.team_lead_name,
-            'company_name': previous_participant.company_name,
-            'event_id': next_event.id,
-            'previous_participant_id': previous_participant.id,
-            'is_latest': True
-        })
+        new_participant = self._advance_to_event(previous_participant, next_event)
         
         _logger.info(f"Created new participant {new_participant.id} for {next_session_type} "
                     f"in cohort {previous_participant.cohort} (previous: {previous_participant.id})")
         
         return new_participant
 
+    @api.model
+    def advance_cohort(self, cohort, from_session, facilitator_id=None):
+        """
+        Move every latest participant of a cohort's ``from_session`` into
+        the next session, in one transaction.
+
+        Cohort names are numbered per facilitator, so participants are
+        matched to the next session of their own facilitator unless
+        ``facilitator_id`` narrows the cohort to one facilitator. The rows
+        are locked and ``is_latest`` is cleared with one UPDATE, then the
+        next-session participants and their user_inputs are created with
+        multi-creates and their invitations queued in one call.
+
+        Returns a dict with the ids of the next-session participants and
+        the ids left in place because no next session is scheduled.
+        """
+        next_type = self._get_next_session_type(from_session)
+        if not next_type:
+            raise UserError(f"There is no session after '{from_session}'")
+
+        start = time.monotonic()
+        self.flush_model(['cohort', 'session_type', 'is_latest', 'facilitator_id'])
+        query = """
+            SELECT id FROM inclue_participant
+             WHERE cohort = %s AND session_type = %s AND is_latest
+        """
+        params = [cohort, from_session]
+        if facilitator_id:
+            query += " AND facilitator_id = %s"
+            params.append(facilitator_id)
+        # Lock the rows so lazy advances of the same people wait for us
+        self.env.cr.execute(query + " ORDER BY id FOR UPDATE", params)
+        participants = self.browse([row[0] for row in self.env.cr.fetchall()])
+        if not participants:
+            return {'advanced': [], 'unscheduled': []}
+
+        next_events = {}
+        for event in self.env['event.event'].search([
+            ('is_inclue_event', '=', True),
+            ('cohort', '=', cohort),
+            ('session_type', '=', next_type),
+            ('facilitator_id', 'in', participants.mapped('facilitator_id').ids + [False]),
+        ], order='date_begin, id'):
+            next_events.setdefault(event.facilitator_id.id, event)
+
+        by_event = {}
+        unscheduled = self.browse()
+        for participant in participants:
+            event = next_events.get(participant.facilitator_id.id)
+            if event:
+                by_event.setdefault(event, self.browse())
+                by_event[event] |= participant
+            else:
+                unscheduled |= participant
+
+        movable = participants - unscheduled
+        movable.sudo().with_context(**BULK_CONTEXT).write({'is_latest': False})
+        # Cleared in the database before the new latest rows are inserted
+        movable.flush_recordset(['is_latest'])
+
+        Participant = self.with_context(**BULK_CONTEXT)
+        advanced = self.browse()
+        for event, previous_participants in by_event.items():
+            advanced |= Participant._advance_to_event(previous_participants, event)
+        advanced._post_bulk_summary(f"moved here from {from_session}")
+
+        _logger.info("Advanced cohort %s from %s to %s: %d participants moved, %d without a scheduled session in %.2fs",
+                     cohort, from_session, next_type, len(advanced), len(unscheduled), time.monotonic() - start)
+        return {
+            'advanced': advanced.ids,
+            'unscheduled': unscheduled.ids,
+        }
+
+    def _post_bulk_summary(self, action):
+        """Post one note per event summarizing a mass operation on these participants
+
+        Replaces the per-participant tracking messages skipped under
+        ``BULK_CONTEXT``.
+        """
+        counts = {}
+        for participant in self:
+            counts[participant.event_id] = counts.get(participant.event_id, 0) + 1
+        for event, count in counts.items():
+            event.message_post(
+                body=f"{count} participant{'s' if count > 1 else ''} {action}.",
+                subtype_xmlid='mail.mt_note',
+            )
+
+    def _advance_to_event(self, previous_participants, next_event):
+        """Move participants to ``next_event``, reusing participants already there
+
+        Works on a whole recordset with one search, two writes and one
+        multi-create. Returns the participants of ``next_event``.
+        """
+        if not previous_participants:
+            return self.browse()
+        
+        existing_next_participants = self.search([
+            ('email_normalized', 'in', list(set(previous_participants.mapped('email_normalized')))),
+            ('event_id', '=', next_event.id)
+        ])
+        existing_by_email = {p.email_normalized: p for p in existing_next_participants}
+        
+        # advance_cohort() flips the whole cohort beforehand
+        previous_participants.filtered('is_latest').sudo().write({'is_latest': False})
+        # create() inserts right away, the unique is_latest index must not see
+        # the previous rows as latest anymore
+        previous_participants.flush_recordset(['is_latest'])
+        
+        reused = self.browse()
+        vals_list = []
+        seen = set()
+        for previous_participant in previous_participants:
+            key = previous_participant.email_normalized
+            if key in seen:
+                continue
+            seen.add(key)
+            if key in existing_by_email:
+                reused |= existing_by_email[key]
+                continue
+            vals_list.append({
+                'name': previous_participant.name,
+                'email': previous_participant.email,
+                'team_lead_name': previous_participant.team_lead_name,
+                'company_name': previous_participant.company_name,
+                'event_id': next_event.id,
+                'previous_participant_id': previous_participant.id,
+                'is_latest': True
+            })
+        
+        if reused:
+            reused.sudo().write({'is_latest': True})
+            self.env['inclue.journey.progress']._sync_participants(reused)
+            _logger.info(f"Found existing participants {reused.ids} for {next_event.session_type}")
+        
+        created = self.create(vals_list) if vals_list else self.browse()
+        return reused | created
+
+    @api.model
+    def cron_create_followup_sessions(self):
+        """
+        Cron job: move participants who completed their session into the
+        next scheduled session of their cohort.
+
+        Candidates come from one indexed query, processed in bounded chunks
+        with a commit per chunk. A watermark on the participant id lets an
+        interrupted run resume where it stopped; it is reset once a full
+        pass finds no more candidates.
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        chunk_size = int(ICP.get_param('inclue.followup_cron_chunk_size', 200))
+        max_chunks = int(ICP.get_param('inclue.followup_cron_max_chunks', 10))
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        
+        next_sessions = list(zip(SESSION_SEQUENCE, SESSION_SEQUENCE[1:]))
+        values_sql = ', '.join(["(%s, %s)"] * len(next_sessions))
+        query = f"""
+            SELECT p.id, e.id
+              FROM inclue_participant p
+              JOIN (VALUES {values_sql}) AS seq (session, next_session)
+                ON seq.session = p.session_type
+              JOIN LATERAL (
+                    SELECT ev.id
+                      FROM event_event ev
+                     WHERE ev.cohort = p.cohort
+                       AND ev.session_type = seq.next_session
+                       AND ev.facilitator_id IS NOT DISTINCT FROM p.facilitator_id
+                       AND ev.is_inclue_event
+                       AND ev.active
+                     ORDER BY ev.date_begin, ev.id
+                     LIMIT 1
+                   ) e ON TRUE
+             WHERE p.is_latest
+               AND p.survey_completed
+               AND p.session_type <> 'followup6'
+               AND p.id > %s
+             ORDER BY p.id
+             LIMIT %s
+        """
+        
+        watermark = ICP._get_inclue_watermark('inclue.followup_cron_watermark')
+        advanced = 0
+        for _ in range(max_chunks):
+            self.flush_model()
+            self.env.cr.execute(query, [value for pair in next_sessions for value in pair] + [watermark, chunk_size])
+            rows = self.env.cr.fetchall()
+            if not rows:
+                watermark = 0
+                break
+            
+            by_event = {}
+            for participant_id, event_id in rows:
+                by_event.setdefault(event_id, []).append(participant_id)
+            Participant = self.with_context(**BULK_CONTEXT)
+            try:
+                with self.env.cr.savepoint():
+                    moved = self.browse()
+                    for event_id, participant_ids in by_event.items():
+                        moved |= Participant._advance_to_event(Participant.browse(participant_ids), self.env['event.event'].browse(event_id))
+                    moved._post_bulk_summary("moved here by the follow-up session job")
+                advanced += len(rows)
+            except Exception as e:
+                _logger.error("Failed to advance participants %s: %s", [row[0] for row in rows], str(e))
+            
+            watermark = rows[-1][0] if len(rows) == chunk_size else 0
+            ICP._set_inclue_watermark('inclue.followup_cron_watermark', watermark)
+            if auto_commit:
+                self.env.cr.commit()
+            if not watermark:
+                break
+        
+        ICP._set_inclue_watermark('inclue.followup_cron_watermark', watermark)
+        _logger.info("Follow-up cron: advanced %d participants (watermark %s)", advanced, watermark)
+        return advanced
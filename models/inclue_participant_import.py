@@ -0,0 +1,123 @@
+import base64
+import csv
+import io
+from odoo import models, fields
+from odoo.exceptions import UserError
+import logging
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+_logger = logging.getLogger(__name__)
+
+# Spreadsheet headers accepted for each participant field
+IMPORT_COLUMNS = {
+    'email': 'email',
+    'e-mail': 'email',
+    'email address': 'email',
+    'name': 'name',
+    'full name': 'name',
+    'participant': 'name',
+    'team lead': 'team_lead_name',
+    'team lead name': 'team_lead_name',
+    'team_lead_name': 'team_lead_name',
+    'manager': 'team_lead_name',
+    'company': 'company_name',
+    'company name': 'company_name',
+    'company_name': 'company_name',
+}
+
+
+def iter_import_rows(content, filename):
+    """Yield one participant dict per data row of a CSV or XLSX file
+
+    Rows are read one at a time so the parsed file never sits in memory.
+    """
+    if (filename or '').lower().endswith('.xlsx'):
+        rows = _iter_xlsx(content)
+    else:
+        rows = _iter_csv(content)
+
+    header = next(rows, None)
+    if not header:
+        return
+    columns = [IMPORT_COLUMNS.get(str(cell or '').strip().lower()) for cell in header]
+    if 'email' not in columns:
+        raise UserError("The file must have an 'Email' column")
+
+    for row in rows:
+        values = {}
+        for column, cell in zip(columns, row):
+            if column and cell not in (None, ''):
+                values[column] = str(cell).strip()
+        yield values
+
+
+def _iter_csv(content):
+    stream = io.TextIOWrapper(io.BytesIO(content), encoding='utf-8-sig', newline='')
+    try:
+        dialect = csv.Sniffer().sniff(stream.read(4096), delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    stream.seek(0)
+    yield from csv.reader(stream, dialect)
+
+
+def _iter_xlsx(content):
+    if openpyxl is None:
+        raise UserError("Importing XLSX files requires the openpyxl Python library, please upload a CSV file instead")
+    workbook = openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+class InclueParticipantImport(models.TransientModel):
+    """Import a participant list received from HR into an event"""
+    _name = 'inclue.participant.import'
+    _description = 'iN-Clue Participant Import'
+
+    event_id = fields.Many2one('event.event', string='Event', required=True,
+                               domain=[('is_inclue_event', '=', True)])
+    import_file = fields.Binary('File', required=True, attachment=False,
+                                help="CSV or XLSX file with an Email column and optional Name, Team Lead and Company columns")
+    filename = fields.Char('File Name')
+    send_invitations = fields.Boolean('Send Invitations', default=True)
+
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('done', 'Done'),
+    ], default='draft')
+    created_count = fields.Integer('Created', readonly=True)
+    skipped_count = fields.Integer('Skipped', readonly=True)
+    error_report = fields.Text('Skipped Rows', readonly=True)
+
+    def action_import(self):
+        self.ensure_one()
+        # The header is line 1, so data rows start at line 2
+        result = self.env['inclue.participant'].import_participants(
+            self.event_id.id,
+            iter_import_rows(base64.b64decode(self.import_file), self.filename),
+            first_row=2,
+            send_invitations=self.send_invitations,
+        )
+
+        self.write({
+            'state': 'done',
+            'created_count': len(result['created']),
+            'skipped_count': len(result['skipped']),
+            'error_report': '\n'.join(
+                f"Line {skip['row']}: {skip['email'] or '(empty)'} - {skip['reason']}" for skip in result['skipped']
+            ),
+        })
+
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
@@ -0,0 +1,39 @@
+from odoo import models, api, tools
+
+
+class IrConfigParameter(models.Model):
+    _inherit = 'ir.config_parameter'
+
+    @api.model
+    @tools.ormcache()
+    def _get_inclue_base_url(self):
+        """Return ``web.base.url`` from the registry cache
+
+        ir.config_parameter clears the registry caches on every create,
+        write and unlink, so changing ``web.base.url`` invalidates this
+        value in all workers.
+        """
+        return self.sudo().get_param('web.base.url') or ''
+
+    @api.model
+    def _get_inclue_watermark(self, key):
+        """Read an integer cron watermark without going through the cache"""
+        self.env.cr.execute("SELECT value FROM ir_config_parameter WHERE key = %s", (key,))
+        row = self.env.cr.fetchone()
+        return int(row[0]) if row and row[0] and row[0].isdigit() else 0
+
+    @api.model
+    def _set_inclue_watermark(self, key, value):
+        """Store a cron watermark
+
+        Written in SQL on purpose: going through write() would clear the
+        registry caches of every worker after each chunk.
+        """
+        self.env.cr.execute("""
+            INSERT INTO ir_config_parameter (key, value, create_uid, write_uid, create_date, write_date)
+            VALUES (%s, %s, %s, %s, now() at time zone 'UTC', now() at time zone 'UTC')
+            ON CONFLICT (key) DO UPDATE
+               SET value = EXCLUDED.value,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+        """, (key, str(value), self.env.uid, self.env.uid))
@@ -49,6 +49,9 @@ class SurveyUserInput(models.Model):
     def write(self, vals):
         """Override write to handle completion survey completion"""
         result = super().write(vals)
+
+        if 'state' in vals:
+            self._push_state_to_participants(vals['state'])
         
         if 'state' in vals and vals['state'] == 'done':
             for record in self:
@@ -68,6 +71,63 @@ class SurveyUserInput(models.Model):
         
         return result
     
+    def _push_state_to_participants(self, state):
+        """Propagate a state transition to the linked participants
+
+        One set-based update per transition; the start and completion dates
+        are only set the first time a participant reaches that state.
+        """
+        if not self:
+            return
+        
+        Participant = self.env['inclue.participant'].sudo()
+        Participant.flush_model()
+        
+        started = state in ('in_progress', 'done')
+        completed = state == 'done'
+        self.env.cr.execute("""
+            UPDATE inclue_participant p
+               SET survey_state = %(state)s,
+                   survey_started = %(started)s,
+                   survey_completed = %(completed)s,
+                   date_started = CASE WHEN %(started)s THEN COALESCE(p.date_started, %(now)s) ELSE p.date_started END,
+                   date_completed = CASE WHEN %(completed)s THEN COALESCE(p.date_completed, %(now)s) ELSE p.date_completed END,
+                   write_uid = %(uid)s,
+                   write_date = %(now)s
+              FROM inclue_participant old
+             WHERE old.id = p.id
+               AND p.user_input_id IN %(ids)s
+               AND p.survey_state IS DISTINCT FROM %(state)s
+         RETURNING p.id, p.event_id, p.active, old.survey_state
+        """, {
+            'state': state,
+            'started': started,
+            'completed': completed,
+            'now': fields.Datetime.now(),
+            'uid': self.env.uid,
+            'ids': tuple(self.ids),
+        })
+        rows = self.env.cr.fetchall()
+        participants = Participant.browse([row[0] for row in rows])
+        if not participants:
+            return
+        
+        deltas = {}
+        for _participant_id, event_id, active, old_state in rows:
+            if active:
+                delta = deltas.setdefault(event_id, [0, 0, 0])
+                delta[1] += started - (old_state in ('in_progress', 'done'))
+                delta[2] += completed - (old_state == 'done')
+        self.env['event.event']._queue_participant_counters(deltas)
+        
+        participants.invalidate_recordset([
+            'survey_state', 'survey_started', 'survey_completed',
+            'date_started', 'date_completed', 'write_uid', 'write_date',
+        ])
+        _logger.info("Pushed survey state '%s' to %d participants", state, len(participants))
+        participants._invalidate_cohort_progress()
+        self.env['inclue.journey.progress'].sudo()._sync_participants(participants)
+    
     def _process_completion_survey(self):
         """Process completion survey and generate PDF"""
         try:
@@ -485,11 +545,10 @@ class SurveyUserInput(models.Model):
                 })]
             }
             
-            mail = self.env['mail.mail'].create(mail_values)
-            mail.send()
+            self.env['inclue.mail.queue'].enqueue_mail([mail_values])
             
             self.pdf_sent_to_team_lead = True
-            _logger.info("Sent completion PDF to team lead: %s", journey.team_leader_email)
+            _logger.info("Queued completion PDF to team lead: %s", journey.team_leader_email)
             
         except Exception as e:
             _logger.error("Error sending PDF to team lead: %s", str(e))
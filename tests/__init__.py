@@ -0,0 +1,11 @@
+from . import test_enrollment
+from . import test_mail_queue
+from . import test_survey_state
+from . import test_advance_cohort
+from . import test_followup_cron
+from . import test_join_concurrency
+from . import test_reminders
+from . import test_journey_code
+from . import test_cohort_progress
+from . import test_event_counters
+from . import test_import
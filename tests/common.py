@@ -0,0 +1,79 @@
+import logging
+import time
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+from ..models.inclue_participant import SESSION_SEQUENCE
+
+_logger = logging.getLogger(__name__)
+
+
+class InclueCommon(TransactionCase):
+    """Survey configuration, a facilitator and journey helpers shared by the iN-Clue tests"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        SurveyConfig = cls.env['inclue.survey.config'].with_context(active_test=False)
+        for session_type in SESSION_SEQUENCE:
+            survey = cls.env['survey.survey'].create({'title': f'iN-Clue {session_type}'})
+            config = SurveyConfig.search([('session_type', '=', session_type)], limit=1)
+            if config:
+                config.write({'survey_id': survey.id, 'active': True})
+            else:
+                SurveyConfig.create({'session_type': session_type, 'survey_id': survey.id})
+
+        cls.facilitator = cls.env['res.partner'].create({
+            'name': 'Test Facilitator',
+            'email': 'facilitator@example.com',
+            'is_facilitator': True,
+        })
+
+    @classmethod
+    def _create_journey(cls, cohort, facilitator=None, sessions=SESSION_SEQUENCE):
+        """Create the sessions of a journey, kickoff first
+
+        The kickoff hooks are skipped so no invoice is attempted; the
+        kickoff still gets a journey code.
+        """
+        facilitator = facilitator or cls.facilitator
+        Event = cls.env['event.event'].with_context(inclue_skip_kickoff_hooks=True)
+        start = fields.Datetime.now() + timedelta(days=1)
+        vals_list = []
+        for index, session_type in enumerate(sessions):
+            date_begin = start + timedelta(days=30 * index)
+            vals_list.append({
+                'name': f'{cohort} - {session_type}',
+                'is_inclue_event': True,
+                'session_type': session_type,
+                'cohort': cohort,
+                'facilitator_id': facilitator.id,
+                'company_id': cls.env.company.id,
+                'contact_person': 'Test Contact',
+                'date_begin': date_begin,
+                'date_end': date_begin + timedelta(hours=2),
+                'journey_code': Event._generate_journey_code() if session_type == 'kickoff' else False,
+            })
+        events = Event.create(vals_list)
+        kickoff = events.filtered(lambda e: e.session_type == 'kickoff')
+        (events - kickoff).write({'parent_kickoff_id': kickoff.id})
+        return events
+
+    @staticmethod
+    def _participant_rows(count, prefix):
+        return [{
+            'email': f'{prefix}.{index}@example.com',
+            'name': f'{prefix.title()} {index}',
+            'company_name': 'Test Company',
+        } for index in range(count)]
+
+    def _measure(self, func, *args, **kwargs):
+        """Run ``func`` and flush, return ``(queries, seconds, result)``"""
+        self.env.flush_all()
+        queries = self.cr.sql_log_count
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.env.flush_all()
+        return self.cr.sql_log_count - queries, time.perf_counter() - start, result
@@ -0,0 +1,82 @@
+import logging
+
+from odoo.tests import tagged
+
+from .common import InclueCommon
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install')
+class TestAdvanceCohort(InclueCommon):
+
+    def test_advance_cohort_benchmark(self):
+        """500 kickoff participants moved to the first follow-up at once
+
+        The cohort is advanced with set-based writes and multi-creates, so
+        the number of queries does not follow the number of participants.
+        """
+        size = 500
+        kickoff, followup1 = self._create_journey('AdvanceBench', sessions=['kickoff', 'followup1'])
+        Participant = self.env['inclue.participant']
+        result = Participant.enroll_batch(kickoff.id, self._participant_rows(size, 'advance'))
+        kickoff_participants = Participant.browse(result['created'])
+        self.assertEqual(len(kickoff_participants), size)
+
+        queries, seconds, result = self._measure(
+            Participant.advance_cohort, 'AdvanceBench', 'kickoff', self.facilitator.id)
+        _logger.info("advance_cohort of %d participants: %d queries, %.3fs", size, queries, seconds)
+
+        self.assertEqual(len(result['advanced']), size)
+        self.assertFalse(result['unscheduled'])
+        self.assertLess(queries, size, "advance_cohort should not run queries per participant")
+
+        advanced = Participant.browse(result['advanced'])
+        self.assertEqual(set(advanced.mapped('event_id').ids), {followup1.id})
+        self.assertTrue(all(advanced.mapped('is_latest')))
+        kickoff_participants.invalidate_recordset(['is_latest'])
+        self.assertFalse(any(kickoff_participants.mapped('is_latest')))
+        self.assertEqual(advanced.mapped('previous_participant_id'), kickoff_participants)
+
+    def _assert_latest_in(self, cohort, event, count):
+        """Each of ``count`` people of ``cohort`` has one latest row, in ``event``"""
+        self.env.flush_all()
+        self.env.cr.execute("""
+            SELECT email_normalized, array_agg(event_id)
+              FROM inclue_participant
+             WHERE cohort = %s AND is_latest
+             GROUP BY email_normalized
+        """, (cohort,))
+        rows = self.env.cr.fetchall()
+        self.assertEqual(len(rows), count)
+        self.assertTrue(all(events == [event.id] for _email, events in rows))
+
+    def test_advance_cohort_latest_index(self):
+        """The previous rows are no longer latest in the database when the next ones are inserted"""
+        self.env.cr.execute("SELECT 1 FROM pg_indexes WHERE indexname = 'inclue_participant_journey_latest_uniq'")
+        self.assertTrue(self.env.cr.fetchone(), "The unique is_latest index is what this test guards against")
+
+        kickoff, _followup1, followup2 = self._create_journey('AdvanceLatest', sessions=['kickoff', 'followup1', 'followup2'])
+        Participant = self.env['inclue.participant']
+        Participant.enroll_batch(kickoff.id, self._participant_rows(3, 'latest'))
+
+        Participant.advance_cohort('AdvanceLatest', 'kickoff', self.facilitator.id)
+        result = Participant.advance_cohort('AdvanceLatest', 'followup1', self.facilitator.id)
+        self.assertEqual(len(result['advanced']), 3)
+        self._assert_latest_in('AdvanceLatest', followup2, 3)
+
+    def test_lazy_advance_latest_index(self):
+        """Journey-code and follow-up job advances respect the unique is_latest index"""
+        kickoff, followup1 = self._create_journey('LazyLatest', sessions=['kickoff', 'followup1'])
+        Participant = self.env['inclue.participant']
+        emails = ['lazy.code@example.com', 'lazy.cron@example.com']
+        participants = Participant.browse()
+        for email in emails:
+            participant, _message = Participant.find_or_create_by_journey_code(kickoff.journey_code, email)
+            participants |= participant
+        participants.mapped('user_input_id').write({'state': 'done'})
+
+        participant, message = Participant.find_or_create_by_journey_code(kickoff.journey_code, emails[0])
+        self.assertEqual(participant.event_id, followup1, message)
+        self.assertEqual(Participant.cron_create_followup_sessions(), 1)
+        self._assert_latest_in('LazyLatest', followup1, 2)
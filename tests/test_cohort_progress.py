@@ -0,0 +1,33 @@
+from odoo.tests import tagged
+from odoo.tests.common import new_test_user
+
+from .common import InclueCommon
+
+
+@tagged('post_install', '-at_install')
+class TestCohortProgress(InclueCommon):
+
+    def test_progress_per_user(self):
+        """Counts cached for one user are not served to a user with narrower record rules"""
+        kickoff = self._create_journey('ProgressRules', sessions=['kickoff'])
+        Participant = self.env['inclue.participant']
+        Participant.enroll_batch(kickoff.id, [{'email': 'progress.visible@example.com'},
+                                              {'email': 'progress.hidden@example.com'}])
+        group = self.env.ref('inclue_consolidated_approach.group_inclue_user')
+        self.env['ir.rule'].create({
+            'name': 'Hide some participants',
+            'model_id': self.env['ir.model']._get_id('inclue.participant'),
+            'groups': [(4, group.id)],
+            'domain_force': "[('email', 'not ilike', 'hidden')]",
+        })
+        user = new_test_user(self.env, login='progress_user',
+                             groups='base.group_user,inclue_consolidated_approach.group_inclue_user')
+
+        counts, etag = Participant._get_cohort_progress(['ProgressRules'])
+        self.assertEqual(counts['ProgressRules']['kickoff']['new'], 2)
+
+        user_counts, user_etag = Participant.with_user(user)._get_cohort_progress(['ProgressRules'])
+        self.assertEqual(user_counts['ProgressRules']['kickoff']['new'], 1)
+        self.assertNotEqual(user_etag, etag)
+
+        self.assertEqual(Participant._get_cohort_progress(['ProgressRules']), (counts, etag))
@@ -0,0 +1,45 @@
+import logging
+
+from odoo.tests import tagged
+
+from .common import InclueCommon
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install')
+class TestEnrollBatch(InclueCommon):
+
+    def test_enroll_batch(self):
+        kickoff = self._create_journey('EnrollJourney', sessions=['kickoff'])
+        rows = self._participant_rows(3, 'enroll') + [
+            {'email': 'ENROLL.0@example.com'},
+            {'email': 'not-an-email'},
+        ]
+
+        result = self.env['inclue.participant'].enroll_batch(kickoff.id, rows)
+
+        self.assertEqual(len(result['created']), 3)
+        self.assertEqual([skip['reason'] for skip in result['skipped']], ['Duplicate email', 'Invalid email'])
+        participants = self.env['inclue.participant'].browse(result['created'])
+        self.assertTrue(all(participants.mapped('user_input_id')))
+        self.assertEqual(self.env['inclue.mail.queue'].search_count([
+            ('model', '=', 'inclue.participant'), ('res_id', 'in', participants.ids),
+        ]), 3)
+
+    def test_enroll_batch_benchmark(self):
+        """Queries and time of enroll_batch for 10, 100 and 1000 rows
+
+        Once batched, the number of queries no longer follows the number
+        of rows.
+        """
+        for size in (10, 100, 1000):
+            kickoff = self._create_journey(f'EnrollBench{size}', sessions=['kickoff'])
+            rows = self._participant_rows(size, f'bench{size}')
+
+            queries, seconds, result = self._measure(self.env['inclue.participant'].enroll_batch, kickoff.id, rows)
+
+            _logger.info("enroll_batch of %d rows: %d queries, %.3fs", size, queries, seconds)
+            self.assertEqual(len(result['created']), size)
+            if size == 1000:
+                self.assertLess(queries, size, "enroll_batch should not run queries per row")
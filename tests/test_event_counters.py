@@ -0,0 +1,27 @@
+from odoo.tests import tagged
+
+from ..models.inclue_event import COUNTER_DELTAS_KEY
+from .common import InclueCommon
+
+
+@tagged('post_install', '-at_install')
+class TestEventCounters(InclueCommon):
+
+    def _queued_deltas(self, func, *args):
+        """Counter deltas ``func`` queues for the commit, without the zero ones"""
+        self.env.cr.postcommit.clear()
+        func(*args)
+        deltas = self.env.cr.postcommit.data.get(COUNTER_DELTAS_KEY, {})
+        return {event_id: delta for event_id, delta in deltas.items() if any(delta)}
+
+    def test_counters_follow_archive_and_move(self):
+        kickoff, followup1 = self._create_journey('CounterMoves', sessions=['kickoff', 'followup1'])
+        Participant = self.env['inclue.participant']
+        archived, moved = Participant.browse(
+            Participant.enroll_batch(kickoff.id, self._participant_rows(2, 'counter'))['created'])
+        moved.user_input_id.write({'state': 'in_progress'})
+
+        self.assertEqual(self._queued_deltas(archived.action_archive), {kickoff.id: [-1, 0, 0]})
+        self.assertEqual(self._queued_deltas(archived.action_unarchive), {kickoff.id: [1, 0, 0]})
+        self.assertEqual(self._queued_deltas(moved.write, {'event_id': followup1.id}),
+                         {kickoff.id: [-1, -1, 0], followup1.id: [1, 1, 0]})
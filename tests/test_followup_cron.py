@@ -0,0 +1,58 @@
+import logging
+
+from odoo.tests import tagged
+
+from .common import InclueCommon
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install')
+class TestFollowupCron(InclueCommon):
+
+    def _completed_kickoff(self, cohort, size):
+        """Journey with a kickoff and a first follow-up, ``size`` kickoff participants done"""
+        kickoff, followup1 = self._create_journey(cohort, sessions=['kickoff', 'followup1'])
+        result = self.env['inclue.participant'].enroll_batch(kickoff.id, self._participant_rows(size, cohort.lower()))
+        participants = self.env['inclue.participant'].browse(result['created'])
+        participants.mapped('user_input_id').write({'state': 'done'})
+        return participants, followup1
+
+    def _write_volume(self, func, *args):
+        """Run ``func`` and return the tracking values and messages it created"""
+        self.env.flush_all()
+        # tracking values are written by the precommit hooks
+        self.cr.flush()
+        tracking_before = self.env['mail.tracking.value'].search([]).ids
+        messages_before = self.env['mail.message'].search([]).ids
+        func(*args)
+        self.env.flush_all()
+        self.cr.flush()
+        tracking = self.env['mail.tracking.value'].search([('id', 'not in', tracking_before)])
+        messages = self.env['mail.message'].search([('id', 'not in', messages_before)])
+        return tracking, messages
+
+    def test_followup_cron_write_volume(self):
+        """The follow-up job leaves one note per event instead of per-participant chatter
+
+        A plain ORM advance of the same cohort size is measured alongside
+        for comparison.
+        """
+        size = 200
+        plain_participants, plain_followup1 = self._completed_kickoff('PlainVolume', size)
+        participants, followup1 = self._completed_kickoff('CronVolume', size)
+        Participant = self.env['inclue.participant']
+
+        tracking, messages = self._write_volume(Participant._advance_to_event, plain_participants, plain_followup1)
+        _logger.info("Plain advance of %d participants: %d tracking values, %d messages",
+                     size, len(tracking), len(messages))
+
+        tracking, messages = self._write_volume(Participant.cron_create_followup_sessions)
+        _logger.info("Follow-up cron for %d participants: %d tracking values, %d messages",
+                     size, len(tracking), len(messages))
+
+        self.assertEqual(Participant.search_count([('event_id', '=', followup1.id), ('is_latest', '=', True)]), size)
+        self.assertFalse(tracking, "The follow-up job should not track the participants it moves")
+        self.assertFalse(messages.filtered(lambda message: message.model == 'inclue.participant'))
+        self.assertEqual(len(messages.filtered(
+            lambda message: message.model == 'event.event' and message.res_id == followup1.id)), 1)
@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import InclueCommon
+
+
+@tagged('post_install', '-at_install')
+class TestImport(InclueCommon):
+
+    def test_import_without_invitations(self):
+        """Participants imported without an invitation are neither sent nor reminded until invited"""
+        self.env['ir.config_parameter'].sudo().set_param('inclue.reminder_delay_days', 1)
+        kickoff = self._create_journey('ImportQuiet', sessions=['kickoff'])
+        Participant = self.env['inclue.participant']
+        result = Participant.import_participants(kickoff.id, self._participant_rows(3, 'quiet'), send_invitations=False)
+        participants = Participant.browse(result['created'])
+
+        self.assertEqual(len(participants), 3)
+        self.assertFalse(any(participants.mapped('survey_sent')))
+        self.assertFalse(any(participants.mapped('date_sent')))
+        self.assertFalse(self.env['inclue.mail.queue'].search_count([
+            ('model', '=', 'inclue.participant'), ('res_id', 'in', participants.ids),
+        ]))
+        self.assertEqual(Participant.cron_send_reminders(), 0)
+
+        self.assertTrue(participants.send_survey())
+        self.assertTrue(all(participants.mapped('survey_sent')))
+        self.assertTrue(all(participants.mapped('date_sent')))
+        self.assertEqual(self.env['inclue.mail.queue'].search_count([
+            ('model', '=', 'inclue.participant'), ('res_id', 'in', participants.ids),
+        ]), 3)
+
+        # Due from the invitation on, like any other participant
+        participants.flush_recordset()
+        self.env.cr.execute("UPDATE inclue_participant SET date_sent = %s WHERE id IN %s",
+                            (fields.Datetime.now() - timedelta(days=2), tuple(participants.ids)))
+        self.assertEqual(Participant.cron_send_reminders(), 3)
@@ -0,0 +1,116 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from odoo import SUPERUSER_ID, api, fields, tools
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install')
+class TestJoinConcurrency(TransactionCase):
+    """Parallel journey-code joins, each in its own database connection
+
+    The joins commit, so the journey they join is committed beforehand and
+    everything is removed again once the test is done.
+    """
+
+    def _committed_env(self):
+        return api.Environment(self.registry.cursor(), SUPERUSER_ID, {})
+
+    def _create_committed_journey(self):
+        env = self._committed_env()
+        with env.cr:
+            survey = env['survey.survey'].create({'title': 'iN-Clue join concurrency'})
+            config = env['inclue.survey.config'].with_context(active_test=False).search(
+                [('session_type', '=', 'kickoff')], limit=1)
+            # The kickoff configuration is put back as it was afterwards
+            previous_config = config and {'survey_id': config.survey_id.id, 'active': config.active}
+            if config:
+                config.write({'survey_id': survey.id, 'active': True})
+            else:
+                config = config.create({'session_type': 'kickoff', 'survey_id': survey.id})
+            facilitator = env['res.partner'].create({
+                'name': 'Join Concurrency Facilitator',
+                'email': 'join.facilitator@example.com',
+                'is_facilitator': True,
+            })
+            Event = env['event.event'].with_context(inclue_skip_kickoff_hooks=True)
+            date_begin = fields.Datetime.now() + timedelta(days=1)
+            kickoff = Event.create({
+                'name': 'JoinConcurrency - kickoff',
+                'is_inclue_event': True,
+                'session_type': 'kickoff',
+                'cohort': 'JoinConcurrency',
+                'facilitator_id': facilitator.id,
+                'company_id': env.company.id,
+                'contact_person': 'Test Contact',
+                'date_begin': date_begin,
+                'date_end': date_begin + timedelta(hours=2),
+                'journey_code': Event._generate_journey_code(),
+            })
+            ids = (survey.id, config.id, previous_config, facilitator.id, kickoff.id)
+            journey_code = kickoff.journey_code
+        self.addCleanup(self._remove_committed_journey, *ids)
+        return journey_code, kickoff.id
+
+    def _remove_committed_journey(self, survey_id, config_id, previous_config, facilitator_id, kickoff_id):
+        env = self._committed_env()
+        with env.cr:
+            participants = env['inclue.participant'].with_context(active_test=False).search([('event_id', '=', kickoff_id)])
+            env['inclue.mail.queue'].search([('model', '=', 'inclue.participant'), ('res_id', 'in', participants.ids)]).unlink()
+            env['inclue.journey.progress'].search([('participant_id', 'in', participants.ids)]).unlink()
+            user_inputs = participants.mapped('user_input_id')
+            participants.unlink()
+            user_inputs.unlink()
+            env['event.event'].browse(kickoff_id).unlink()
+            env['res.partner'].browse(facilitator_id).unlink()
+            if previous_config:
+                env['inclue.survey.config'].browse(config_id).write(previous_config)
+            else:
+                env['inclue.survey.config'].browse(config_id).unlink()
+            env['survey.survey'].browse(survey_id).unlink()
+
+    def test_parallel_joins(self):
+        """200 joins of 40 people, 5 each, all at once: one participant per person, no failure"""
+        people, joins_per_person = 40, 5
+        journey_code, kickoff_id = self._create_committed_journey()
+        # The joins of one person are submitted back to back so they run side by side
+        emails = [f'join.{index}@example.com' for index in range(people) for _join in range(joins_per_person)]
+
+        # Every worker holds its own cursor plus the one join_journey opens
+        workers = min(len(emails), max(1, (tools.config['db_maxconn'] - 4) // 2))
+
+        def join(email):
+            env = self._committed_env()
+            with env.cr:
+                return email, env['inclue.participant'].join_journey(journey_code, email)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(join, email) for email in emails]
+        errors = [future.exception() for future in futures if future.exception()]
+        self.assertFalse(errors, "Concurrent joins should neither fail nor need a retry")
+
+        participant_ids = {}
+        for email, result in (future.result() for future in futures):
+            self.assertTrue(result['participant_id'], result['message'])
+            self.assertEqual(result['session_type'], 'kickoff')
+            participant_ids.setdefault(email, set()).add(result['participant_id'])
+        self.assertTrue(all(len(ids) == 1 for ids in participant_ids.values()),
+                        "Every join of a person should get the same participant")
+
+        env = self._committed_env()
+        with env.cr:
+            env.cr.execute("""
+                SELECT email_normalized, COUNT(*)
+                  FROM inclue_participant
+                 WHERE event_id = %s AND active
+                 GROUP BY email_normalized
+            """, (kickoff_id,))
+            counts = dict(env.cr.fetchall())
+        self.assertEqual(len(counts), people)
+        self.assertEqual(set(counts.values()), {1})
+        _logger.info("%d parallel joins of %d people with %d workers: one participant each",
+                     len(emails), people, workers)
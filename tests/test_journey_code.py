@@ -0,0 +1,28 @@
+from odoo.tests import tagged
+
+from ..models.inclue_event import _kickoff_code_cache
+from .common import InclueCommon
+
+
+@tagged('post_install', '-at_install')
+class TestJourneyCode(InclueCommon):
+
+    def test_lookup_cache(self):
+        """Only resolved codes are cached, and a cached kickoff changed elsewhere is looked up again"""
+        Event = self.env['event.event']
+        kickoff = self._create_journey('CodeCache', sessions=['kickoff'])
+        code = kickoff.journey_code.upper()
+        key = (self.env.cr.dbname, code)
+
+        self.assertFalse(Event.find_journey_by_code('ZZZZ0000'))
+        self.assertNotIn((self.env.cr.dbname, 'ZZZZ0000'), _kickoff_code_cache)
+
+        self.assertEqual(Event.find_journey_by_code(code.lower()), kickoff)
+        self.assertEqual(_kickoff_code_cache.get(key), kickoff.id)
+
+        # Archived by another worker: this worker's entry was not dropped
+        kickoff.flush_recordset()
+        self.env.cr.execute("UPDATE event_event SET active = FALSE WHERE id = %s", (kickoff.id,))
+        kickoff.invalidate_recordset(['active'])
+        self.assertFalse(Event.find_journey_by_code(code))
+        self.assertNotIn(key, _kickoff_code_cache)
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.addons.mail.models.mail_mail import MailMail
+from odoo.addons.mail.tests.common import MailCommon
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestMailQueue(MailCommon):
+
+    def _enqueue_sync(self, **values):
+        return self.env['inclue.mail.queue'].with_context(inclue_mail_sync=True).enqueue_mail([dict({
+            'subject': 'Mail queue test',
+            'body_html': '<p>Hello</p>',
+            'email_from': 'noreply@example.com',
+            'email_to': 'participant@example.com',
+        }, **values)])
+
+    def test_dispatch_auto_delete(self):
+        """A mail unlinked by its own successful send is sent once and recorded as sent"""
+        with self.mock_mail_gateway(mail_unlink_sent=True):
+            entry = self._enqueue_sync(auto_delete=True)
+
+        self.assertEqual(len(self._mails), 1)
+        self.assertEqual(entry.state, 'sent')
+        self.assertEqual(entry.attempts, 1)
+        self.assertFalse(entry.mail_id)
+        self.assertFalse(entry.last_error)
+
+    def test_dispatch_keeps_mail(self):
+        with self.mock_mail_gateway():
+            entry = self._enqueue_sync(auto_delete=False)
+
+        self.assertEqual(len(self._mails), 1)
+        self.assertEqual(entry.state, 'sent')
+        self.assertEqual(entry.mail_id.state, 'sent')
+
+    def test_dispatch_failure_retries(self):
+        before = fields.Datetime.now()
+        with self.mock_mail_gateway(), patch.object(MailMail, 'send', side_effect=Exception('SMTP unavailable')):
+            entry = self._enqueue_sync()
+
+        self.assertEqual(entry.state, 'pending')
+        self.assertEqual(entry.attempts, 1)
+        self.assertIn('SMTP unavailable', entry.last_error)
+        self.assertGreater(entry.next_attempt_at, before)
+
+    def test_dispatch_failure_gives_up(self):
+        self.env['ir.config_parameter'].sudo().set_param('inclue.mail_queue_max_attempts', 1)
+        with self.mock_mail_gateway(), patch.object(MailMail, 'send', side_effect=Exception('SMTP unavailable')):
+            entry = self._enqueue_sync()
+
+        self.assertEqual(entry.state, 'failed')
+        self.assertEqual(entry.attempts, 1)
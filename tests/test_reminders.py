@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import InclueCommon
+
+
+@tagged('post_install', '-at_install')
+class TestReminders(InclueCommon):
+
+    def test_reminders_stop_at_cap(self):
+        """The last allowed reminder takes the participant out of the reminder candidates"""
+        ICP = self.env['ir.config_parameter'].sudo()
+        ICP.set_param('inclue.reminder_delay_days', 1)
+        ICP.set_param('inclue.reminder_max_count', 2)
+        kickoff = self._create_journey('ReminderCap', sessions=['kickoff'])
+        Participant = self.env['inclue.participant']
+        participant = Participant.browse(Participant.enroll_batch(kickoff.id, self._participant_rows(1, 'reminder'))['created'])
+
+        for expected_count in (1, 2):
+            participant.flush_recordset()
+            self.env.cr.execute("""
+                UPDATE inclue_participant SET date_sent = %s, last_reminder_at = NULL WHERE id = %s
+            """, (fields.Datetime.now() - timedelta(days=2), participant.id))
+            participant.invalidate_recordset(['date_sent', 'last_reminder_at'])
+            self.assertEqual(Participant.cron_send_reminders(), 1)
+            self.assertEqual(participant.reminder_count, expected_count)
+
+        self.assertTrue(participant.reminders_exhausted)
+        self.env.cr.execute("UPDATE inclue_participant SET last_reminder_at = NULL WHERE id = %s", (participant.id,))
+        self.assertEqual(Participant.cron_send_reminders(), 0)
@@ -0,0 +1,48 @@
+import logging
+
+from odoo.tests import tagged
+
+from .common import InclueCommon
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install')
+class TestSurveyStatePush(InclueCommon):
+
+    def test_state_push_benchmark(self):
+        """1000 participants of a kickoff start and then submit their survey
+
+        The starts are written one response at a time, as they arrive from
+        the survey pages; the submissions at the end of the session are
+        written together. Timestamps are only set on the first transition.
+        """
+        size = 1000
+        kickoff = self._create_journey('StateBench', sessions=['kickoff'])
+        result = self.env['inclue.participant'].enroll_batch(kickoff.id, self._participant_rows(size, 'state'))
+        participants = self.env['inclue.participant'].browse(result['created'])
+        user_inputs = participants.mapped('user_input_id')
+        self.assertEqual(len(user_inputs), size)
+
+        def start_one_by_one():
+            for user_input in user_inputs:
+                user_input.write({'state': 'in_progress'})
+
+        queries, seconds, _result = self._measure(start_one_by_one)
+        _logger.info("%d survey starts one by one: %d queries (%.1f per start), %.3fs",
+                     size, queries, queries / size, seconds)
+
+        participants.invalidate_recordset()
+        self.assertEqual(set(participants.mapped('survey_state')), {'in_progress'})
+        self.assertTrue(all(participants.mapped('date_started')))
+        date_started = {participant.id: participant.date_started for participant in participants}
+
+        queries, seconds, _result = self._measure(user_inputs.write, {'state': 'done'})
+        _logger.info("%d survey submissions at once: %d queries, %.3fs", size, queries, seconds)
+        self.assertLess(queries, size, "State transitions should be pushed with set-based updates")
+
+        participants.invalidate_recordset()
+        self.assertEqual(set(participants.mapped('survey_state')), {'done'})
+        self.assertTrue(all(participants.mapped('survey_completed')))
+        self.assertTrue(all(participants.mapped('date_completed')))
+        self.assertEqual({participant.id: participant.date_started for participant in participants}, date_started)